@@ -1,5 +1,5 @@
-from fastapi import FastAPI, HTTPException, Query, Body
-import requests
+from fastapi import FastAPI, HTTPException, Query, Body, Request, Response
+import httpx
 import os
 
 # CRITICAL: Force Playwright to look in the correct location on Render
@@ -10,22 +10,31 @@ if os.path.exists(playwright_path):
 
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse, JSONResponse
 import logging
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Awaitable, AsyncIterator
+from collections import deque, OrderedDict
 from pydantic import BaseModel
 import re
+import math
+import random
 import urllib.parse
 from bs4 import BeautifulSoup
 import time
 import json
+import csv
+import hashlib
+import sqlite3
+import threading
+import uuid
 from serpapi import GoogleSearch
 
 # Playwright for fast TikTok scraping
 import asyncio
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv() # load the env
 
@@ -33,89 +42,2284 @@ load_dotenv() # load the env
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# ==================== CACHE LAYER FOR TIKTOK ====================
-class SimpleCache:
-    """Simple TTL-based in-memory cache for TikTok videos"""
+# ==================== PERSISTENT CACHE TIER ====================
+class PersistentCache:
+    """
+    SQLite-backed second-level cache behind the in-memory LRUCaches.
+    
+    Values are stored as JSON with their absolute expiry, so a restart picks
+    up exactly where the previous process left off. Rows are kept until
+    keep_until (expiry plus the owning cache's stale window). compact() drops
+    dead rows and, above max_bytes, the least recently read ones.
+    Storage errors are logged and treated as misses; the disk tier must never
+    fail a request. Async callers go through run()/submit(), which use one
+    dedicated thread so disk I/O stays off the event loop and writes land in
+    the order they were issued.
+    """
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistent-cache")
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                keep_until REAL NOT NULL,
+                size INTEGER NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_hot ON cache_entries (namespace, hits)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (accessed_at)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_locks (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "errors": 0, "compactions": 0, "evictions": 0}
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Await fn(*args) on the disk thread"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def submit(self, fn: Callable, *args):
+        """Queue fn(*args) on the disk thread without waiting (runs inline outside an event loop)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            fn(*args)
+            return
+        self.executor.submit(fn, *args)
+
+    def _execute(self, sql: str, params: tuple = ()) -> Optional[list]:
+        try:
+            with self.lock:
+                return self.conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            self.counters["errors"] += 1
+            logger.warning(f"⚠️ Persistent cache error: {str(e)}")
+            return None
+
+    def get(self, key: str) -> Optional[tuple]:
+        """
+        Returns:
+            (value, expires_at) or None if absent or past keep_until
+        """
+        now = time.time()
+        rows = self._execute("SELECT value, expires_at FROM cache_entries WHERE key = ? AND keep_until > ?", (key, now))
+        if not rows:
+            self.counters["misses"] += 1
+            return None
+
+        self._execute("UPDATE cache_entries SET hits = hits + 1, accessed_at = ? WHERE key = ?", (now, key))
+        self.counters["hits"] += 1
+        value, expires_at = rows[0]
+        return json.loads(value), expires_at
+
+    def set(self, key: str, value: Any, expires_at: float, keep_until: float):
+        try:
+            payload = json.dumps(value, default=str)
+        except (TypeError, ValueError):
+            return
+        self._execute(
+            """
+            INSERT INTO cache_entries (key, namespace, value, expires_at, keep_until, size, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value = excluded.value,
+                expires_at = excluded.expires_at,
+                keep_until = excluded.keep_until,
+                size = excluded.size,
+                accessed_at = excluded.accessed_at
+            """,
+            (key, key.split(":", 1)[0], payload, expires_at, keep_until, len(payload), time.time())
+        )
+        self.counters["writes"] += 1
+
+    def delete(self, key: str):
+        self._execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def try_lock(self, key: str, owner: str, ttl: float) -> Optional[bool]:
+        """
+        Take an expiring lock on key, atomically across every process using this file.
+        
+        Returns:
+            True if owner now holds the lock, False if someone else does,
+            None if the database could not be reached
+        """
+        now = time.time()
+        self._execute("DELETE FROM cache_locks WHERE key = ? AND expires_at <= ?", (key, now))
+        self._execute("INSERT OR IGNORE INTO cache_locks (key, owner, expires_at) VALUES (?, ?, ?)", (key, owner, now + ttl))
+        rows = self._execute("SELECT owner FROM cache_locks WHERE key = ?", (key,))
+        if rows is None:
+            return None
+        return bool(rows) and rows[0][0] == owner
+
+    def unlock(self, key: str, owner: str):
+        self._execute("DELETE FROM cache_locks WHERE key = ? AND owner = ?", (key, owner))
+
+    def hot(self, namespaces: List[str], limit: int) -> List[tuple]:
+        """Most-read live rows in the given namespaces, as (key, value, expires_at)"""
+        if not namespaces or limit <= 0:
+            return []
+        placeholders = ",".join("?" * len(namespaces))
+        rows = self._execute(
+            f"""
+            SELECT key, value, expires_at FROM cache_entries
+            WHERE namespace IN ({placeholders}) AND keep_until > ?
+            ORDER BY hits DESC, accessed_at DESC LIMIT ?
+            """,
+            (*namespaces, time.time(), limit)
+        ) or []
+        return [(key, json.loads(value), expires_at) for key, value, expires_at in rows]
+
+    def compact(self) -> Dict[str, int]:
+        """Drop dead rows, then least recently read rows until under max_bytes"""
+        self._execute("DELETE FROM cache_entries WHERE keep_until <= ?", (time.time(),))
+        total = (self._execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries") or [(0,)])[0][0]
+
+        evicted = 0
+        if total > self.max_bytes:
+            # Leave some headroom so compaction doesn't run on every write
+            target = int(self.max_bytes * 0.9)
+            for key, size in self._execute("SELECT key, size FROM cache_entries ORDER BY accessed_at ASC") or []:
+                if total <= target:
+                    break
+                self.delete(key)
+                total -= size
+                evicted += 1
+
+        self._execute("PRAGMA incremental_vacuum")
+        self.counters["compactions"] += 1
+        self.counters["evictions"] += evicted
+        return {"bytes": total, "evicted": evicted}
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self._execute("SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries GROUP BY namespace") or []
+        return {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "namespaces": {namespace: {"entries": count, "bytes": size} for namespace, count, size in rows},
+            **self.counters
+        }
+
+    def _close_connection(self):
+        with self.lock:
+            self.conn.close()
+
+    async def close(self):
+        """Close the database on the disk thread, after the writes queued ahead of it"""
+        await self.run(self._close_connection)
+        self.executor.shutdown(wait=False)
+
+def open_persistent_cache() -> Optional[PersistentCache]:
+    """
+    Open the disk tier at PERSISTENT_CACHE_PATH.
+    
+    Disabled unless a path is set; point it at a data directory outside the
+    source tree (e.g. /var/lib/plyce/cache.sqlite3). Called from the startup
+    hook, so importing the app never creates the file.
+    """
+    path = os.getenv("PERSISTENT_CACHE_PATH", "")
+    if not path:
+        return None
+    try:
+        cache = PersistentCache(path, max_bytes=int(os.getenv("PERSISTENT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))))
+        logger.info(f"💽 Persistent cache at {path}")
+        return cache
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Persistent cache disabled, could not open {path}: {str(e)}")
+        return None
+
+# Opened by the startup hook (see attach_persistent_cache)
+persistent_cache: Optional[PersistentCache] = None
+
+# ==================== CACHE ENGINE ====================
+# Every LRUCache registers itself here so the sweeper and /debug/cache can find it
+cache_registry: Dict[str, "LRUCache"] = {}
+
+class LRUCache:
+    """
+    Bounded in-memory cache with LRU eviction, per-namespace TTLs and
+    periodic expiry sweeps.
+    
+    Keys are namespaced by their prefix up to the first ':' (e.g. 'tiktok' in
+    'tiktok:{place_id}'); namespace_ttls overrides default_ttl per namespace.
+    Bounded by max_entries and, optionally, by the approximate JSON size of
+    the stored values (max_bytes). Entries are kept for stale_ttl seconds past
+    their expiry so get_with_age() can serve them while they are revalidated.
+    With persistent=True the cache opts into the disk tier once it is opened:
+    writes go through to disk in the background and aget()/aget_with_age()
+    read memory misses back from it off the event loop (get() and
+    get_with_age() only look at memory). Values must then be JSON-serializable.
+    """
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        default_ttl: int = 600,
+        namespace_ttls: Optional[Dict[str, int]] = None,
+        stale_ttl: int = 0,
+        persistent: bool = False
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.namespace_ttls = namespace_ttls or {}
+        self.stale_ttl = stale_ttl
+        self.persist = persistent
+        # Set by attach_persistent_cache() when the disk tier is enabled
+        self.persistent: Optional[PersistentCache] = None
+        # key -> (value, expiry timestamp, approximate size in bytes)
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.total_bytes = 0
+        self.counters = {
+            "hits": 0, "stale_hits": 0, "disk_hits": 0, "misses": 0,
+            "sets": 0, "evictions": 0, "expirations": 0
+        }
+        cache_registry[name] = self
+
+    @staticmethod
+    def namespace_of(key: str) -> str:
+        return key.split(":", 1)[0]
+
+    @staticmethod
+    def _size_of(value: Any) -> int:
+        try:
+            return len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return 0
+
+    def ttl_for(self, key: str) -> int:
+        return self.namespace_ttls.get(self.namespace_of(key), self.default_ttl)
+
+    def _remove(self, key: str):
+        _, _, size = self.entries.pop(key)
+        self.total_bytes -= size
+
+    def _insert(self, key: str, value: Any, expiry: float) -> bool:
+        size = self._size_of(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            # Storing it would flush the whole cache for a single value
+            logger.warning(f"⚠️ Not caching {key}: {size} bytes exceeds {self.name} cache budget")
+            return False
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = (value, expiry, size)
+        self.total_bytes += size
+        self._evict()
+        return True
+
+    def _entry(self, key: str) -> Optional[tuple]:
+        return self.entries.get(key)
+
+    async def load(self, key: str):
+        """On a memory miss, read key back from the disk tier (off the event loop)"""
+        if key in self.entries or self.persistent is None:
+            return
+        loaded = await self.persistent.run(self.persistent.get, key)
+        # Skip if a fresher value was set while the read was in flight
+        if loaded is not None and key not in self.entries and self._insert(key, *loaded):
+            self.counters["disk_hits"] += 1
+
+    async def warm(self, limit: int) -> int:
+        """Preload the most-read disk entries in this cache's namespaces"""
+        if self.persistent is None:
+            return 0
+        loaded = 0
+        rows = await self.persistent.run(self.persistent.hot, list(self.namespace_ttls), limit)
+        for key, value, expiry in rows:
+            if key not in self.entries:
+                loaded += self._insert(key, value, expiry)
+        return loaded
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entry(key)
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+
+        value, expiry, _ = entry
+        now = time.time()
+        if now >= expiry:
+            if now >= expiry + self.stale_ttl:
+                self._remove(key)
+                self.counters["expirations"] += 1
+            self.counters["misses"] += 1
+            logger.debug(f"⏰ Cache EXPIRED for {key}")
+            return None
+
+        self.entries.move_to_end(key)
+        self.counters["hits"] += 1
+        logger.debug(f"🎯 Cache HIT for {key}")
+        return value
+
+    def get_with_age(self, key: str) -> Optional[tuple]:
+        """
+        Look up a key, also serving entries within the stale window.
+        
+        Returns:
+            (value, expires_in) where expires_in is negative for stale entries,
+            or None if the key is absent or past its stale window
+        """
+        entry = self._entry(key)
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+
+        value, expiry, _ = entry
+        expires_in = expiry - time.time()
+        if expires_in <= -self.stale_ttl:
+            self._remove(key)
+            self.counters["expirations"] += 1
+            self.counters["misses"] += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.counters["hits" if expires_in > 0 else "stale_hits"] += 1
+        return value, expires_in
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get(), falling back to the disk tier"""
+        await self.load(key)
+        return self.get(key)
+
+    async def aget_with_age(self, key: str) -> Optional[tuple]:
+        """get_with_age(), falling back to the disk tier"""
+        await self.load(key)
+        return self.get_with_age(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """TTL in seconds (defaults to the key's namespace TTL)"""
+        ttl = self.ttl_for(key) if ttl is None else ttl
+        expiry = time.time() + ttl
+        if not self._insert(key, value, expiry):
+            return
+        self.counters["sets"] += 1
+        logger.debug(f"💾 Cache SET for {key} (expires in {ttl:.0f}s)")
+        if self.persistent is not None:
+            self.persistent.submit(self.persistent.set, key, value, expiry, expiry + self.stale_ttl)
+
+    def delete(self, key: str):
+        if key in self.entries:
+            self._remove(key)
+        if self.persistent is not None:
+            self.persistent.submit(self.persistent.delete, key)
+
+    def _evict(self):
+        while self.entries and (
+            len(self.entries) > self.max_entries
+            or (self.max_bytes and self.total_bytes > self.max_bytes)
+        ):
+            key = next(iter(self.entries))
+            self._remove(key)
+            self.counters["evictions"] += 1
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were removed"""
+        now = time.time()
+        expired = [key for key, (_, expiry, _) in self.entries.items() if now >= expiry + self.stale_ttl]
+        for key in expired:
+            self._remove(key)
+        self.counters["expirations"] += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        served = self.counters["hits"] + self.counters["stale_hits"]
+        lookups = served + self.counters["misses"]
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "bytes": self.total_bytes if self.max_bytes else None,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(served / lookups, 3) if lookups else None,
+            **self.counters
+        }
+
+    def clear(self):
+        """Drop the in-memory entries (the disk tier is left intact)"""
+        self.entries.clear()
+        self.total_bytes = 0
+        logger.info(f"🧹 Cache CLEARED ({self.name})")
+
+CACHE_SWEEP_INTERVAL = int(os.getenv("CACHE_SWEEP_INTERVAL_SECONDS", "60"))
+PERSISTENT_CACHE_COMPACT_INTERVAL = int(os.getenv("PERSISTENT_CACHE_COMPACT_INTERVAL_SECONDS", "600"))
+PERSISTENT_CACHE_WARM_KEYS = int(os.getenv("PERSISTENT_CACHE_WARM_KEYS", "500"))
+
+async def cache_sweeper(interval: int = CACHE_SWEEP_INTERVAL):
+    """Background task: periodically purge expired entries from every registered cache"""
+    last_compaction = time.time()
+    while True:
+        await asyncio.sleep(interval)
+        for cache in list(cache_registry.values()):
+            removed = cache.sweep()
+            if removed:
+                logger.info(f"🧹 Swept {removed} expired entries from {cache.name} cache")
+
+        if persistent_cache and time.time() - last_compaction >= PERSISTENT_CACHE_COMPACT_INTERVAL:
+            last_compaction = time.time()
+            result = await persistent_cache.run(persistent_cache.compact)
+            logger.info(f"💽 Compacted persistent cache ({result['bytes']} bytes, {result['evicted']} evicted)")
+
+def attach_persistent_cache(cache: Optional[PersistentCache]):
+    """Point every cache that opted into the disk tier at it"""
+    for lru in cache_registry.values():
+        if lru.persist:
+            lru.persistent = cache
+
+async def warm_caches_from_disk() -> int:
+    """Load the hottest persisted keys into every disk-backed cache"""
+    loaded = 0
+    for cache in list(cache_registry.values()):
+        loaded += await cache.warm(PERSISTENT_CACHE_WARM_KEYS)
+    return loaded
+
+cache_sweeper_task: Optional[asyncio.Task] = None
+
+# ==================== SHARED CROSS-WORKER CACHE ====================
+class SharedCacheBackend:
+    """
+    Cache and lock store shared by every worker process on a node.
+    
+    Subclasses implement get/set/try_lock/unlock; get_or_lock() builds the
+    "one miss, one fetch per node" protocol on top. Backend errors degrade
+    to local behaviour (a miss, or a lock we pretend to hold) rather than
+    failing the request.
+    """
+    name = "local"
+
+    def __init__(self):
+        # Identifies this process as a lock owner
+        self.owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        self.counters = {"hits": 0, "misses": 0, "locks_acquired": 0, "lock_waits": 0, "wait_timeouts": 0, "errors": 0}
+
+    async def get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def set(self, key: str, value: Any, ttl: float):
+        pass
+
+    async def try_lock(self, key: str, ttl: float) -> bool:
+        return True
+
+    async def unlock(self, key: str):
+        pass
+
+    async def get_or_lock(
+        self,
+        key: str,
+        lock_ttl: float,
+        wait_timeout: float,
+        poll_interval: float = 0.5,
+        accept: Optional[Callable[[Any], bool]] = None,
+        marker_key: Optional[str] = None
+    ) -> tuple:
+        """
+        Return the shared value for key, or the right to produce it.
+        
+        Args:
+            key: Cache key
+            lock_ttl: Lock expiry in seconds, so a crashed holder can't wedge the key
+            wait_timeout: How long to wait for another worker's value before
+                giving up and producing it ourselves
+            poll_interval: Seconds between checks while another worker holds the lock
+            accept: Predicate a shared value must pass to count as a hit; values
+                it rejects are treated as missing (e.g. too old or too small)
+            marker_key: Key a lock holder publishes to instead of key when it
+                has no value to share (nothing found, or it failed)
+        
+        Returns:
+            (value, None) on a hit, where value is key's value or else the
+            marker_key's; or (None, locked) where locked says whether this
+            process holds the lock and must unlock() it when done
+        """
+        deadline = time.time() + wait_timeout
+        waited = False
+        while True:
+            value = await self.get(key)
+            if value is not None and (accept is None or accept(value)):
+                self.counters["hits"] += 1
+                return value, None
+            
+            marker = await self.get(marker_key) if marker_key else None
+            if marker is not None:
+                self.counters["hits"] += 1
+                return marker, None
+
+            if await self.try_lock(key, lock_ttl):
+                self.counters["misses"] += 1
+                self.counters["locks_acquired"] += 1
+                return None, True
+
+            if not waited:
+                waited = True
+                self.counters["lock_waits"] += 1
+            if time.time() >= deadline:
+                self.counters["wait_timeouts"] += 1
+                self.counters["misses"] += 1
+                return None, False
+            await asyncio.sleep(poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, **self.counters}
+
+    async def close(self):
+        pass
+
+class SQLiteSharedCache(SharedCacheBackend):
+    """
+    Shares the persistent cache file between workers.
+    
+    Uses the same rows as the disk-backed LRUCaches, so a value published
+    here is also what their disk tier reads back; get() only returns values
+    that are still fresh. Queries run on the persistent cache's disk thread.
+    """
+    name = "sqlite"
+
+    def __init__(self, persistent: PersistentCache):
+        super().__init__()
+        self.persistent = persistent
+
+    async def get(self, key: str) -> Optional[Any]:
+        loaded = await self.persistent.run(self.persistent.get, key)
+        if loaded is None or loaded[1] <= time.time():
+            return None
+        return loaded[0]
+
+    async def set(self, key: str, value: Any, ttl: float):
+        # Awaited so it lands before unlock(), or a waiting worker would find nothing
+        expires_at = time.time() + ttl
+        await self.persistent.run(self.persistent.set, key, value, expires_at, expires_at)
+
+    async def try_lock(self, key: str, ttl: float) -> bool:
+        locked = await self.persistent.run(self.persistent.try_lock, key, self.owner, ttl)
+        if locked is None:
+            self.counters["errors"] += 1
+            return True
+        return locked
+
+    async def unlock(self, key: str):
+        await self.persistent.run(self.persistent.unlock, key, self.owner)
+
+class RedisSharedCache(SharedCacheBackend):
+    """
+    Minimal Redis-protocol (RESP) client, speaking only GET, SET and DEL.
+    
+    Works with Redis, Valkey or any local stand-in that implements those
+    commands. Values are JSON; locks are SET NX PX keys under 'lock:'.
+    """
+    name = "redis"
+
+    def __init__(self, url: str, timeout: float = 2.0):
+        super().__init__()
+        parsed = urllib.parse.urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        # One connection, one command in flight at a time
+        self.connection_lock = asyncio.Lock()
+
+    @staticmethod
+    def _encode(*args) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = (await self.reader.readline()).rstrip(b"\r\n")
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        prefix, payload = line[:1], line[1:]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RuntimeError(f"Redis error: {payload.decode()}")
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            count = int(payload)
+            return None if count < 0 else [await self._read_reply() for _ in range(count)]
+        raise ConnectionError(f"Unexpected Redis reply: {line[:50]!r}")
+
+    async def _command(self, *args) -> Any:
+        async with self.connection_lock:
+            try:
+                if self.writer is None:
+                    self.reader, self.writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), self.timeout
+                    )
+                    if self.password:
+                        self.writer.write(self._encode("AUTH", self.password))
+                        await asyncio.wait_for(self._read_reply(), self.timeout)
+                    if self.db:
+                        self.writer.write(self._encode("SELECT", self.db))
+                        await asyncio.wait_for(self._read_reply(), self.timeout)
+                self.writer.write(self._encode(*args))
+                await self.writer.drain()
+                return await asyncio.wait_for(self._read_reply(), self.timeout)
+            except (OSError, ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                await self._disconnect()
+                raise
+
+    async def _disconnect(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            data = await self._command("GET", key)
+        except Exception as e:
+            self.counters["errors"] += 1
+            logger.warning(f"⚠️ Shared cache GET failed: {str(e)}")
+            return None
+        return json.loads(data) if data is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float):
+        try:
+            await self._command("SET", key, json.dumps(value, default=str), "PX", int(ttl * 1000))
+        except Exception as e:
+            self.counters["errors"] += 1
+            logger.warning(f"⚠️ Shared cache SET failed: {str(e)}")
+
+    async def try_lock(self, key: str, ttl: float) -> bool:
+        try:
+            return await self._command("SET", f"lock:{key}", self.owner, "NX", "PX", int(ttl * 1000)) == "OK"
+        except Exception as e:
+            self.counters["errors"] += 1
+            logger.warning(f"⚠️ Shared cache lock failed: {str(e)}")
+            return True
+
+    async def unlock(self, key: str):
+        # GET-then-DEL isn't atomic, but the lock TTL bounds any overlap and
+        # it keeps the stand-in requirements down to GET/SET/DEL
+        try:
+            holder = await self._command("GET", f"lock:{key}")
+            if holder is not None and holder.decode() == self.owner:
+                await self._command("DEL", f"lock:{key}")
+        except Exception as e:
+            self.counters["errors"] += 1
+            logger.warning(f"⚠️ Shared cache unlock failed: {str(e)}")
+
+    async def close(self):
+        await self._disconnect()
+
+def open_shared_cache() -> SharedCacheBackend:
+    """
+    Pick the cross-worker backend from SHARED_CACHE_BACKEND.
+    
+    'redis' uses SHARED_CACHE_URL; 'sqlite' (the default when the persistent
+    tier is enabled) shares its file; 'local' disables cross-worker sharing.
+    """
+    backend = os.getenv("SHARED_CACHE_BACKEND", "sqlite" if persistent_cache else "local").lower()
+    if backend == "redis":
+        url = os.getenv("SHARED_CACHE_URL", "redis://localhost:6379/0")
+        logger.info(f"🔗 Shared cache: Redis protocol at {urllib.parse.urlparse(url).hostname}")
+        return RedisSharedCache(url)
+    if backend == "sqlite" and persistent_cache:
+        logger.info("🔗 Shared cache: persistent SQLite file")
+        return SQLiteSharedCache(persistent_cache)
+    return SharedCacheBackend()
+
+# Replaced by open_shared_cache() in the startup hook, once the disk tier is open
+shared_cache: SharedCacheBackend = SharedCacheBackend()
+
+TIKTOK_CACHE_TTL = int(os.getenv("TIKTOK_CACHE_TTL_SECONDS", "600"))
+# How long an expired scrape may still be served while it is being refreshed
+TIKTOK_STALE_TTL = int(os.getenv("TIKTOK_STALE_TTL_SECONDS", "86400"))
+
+# Global TikTok cache instance
+tiktok_cache = LRUCache(
+    "tiktok",
+    max_entries=int(os.getenv("TIKTOK_CACHE_MAX_ENTRIES", "2000")),
+    max_bytes=int(os.getenv("TIKTOK_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+    namespace_ttls={"tiktok": TIKTOK_CACHE_TTL},
+    stale_ttl=TIKTOK_STALE_TTL,
+    persistent=True
+)
+
+class BackgroundRefresher:
+    """
+    Runs at most one background refresh per cache key and tracks how often
+    each key is read, so popular keys can be refreshed before they expire.
+    """
+    def __init__(self, refresh_ahead: float, min_hits: int, max_tracked: int = 5000):
+        self.refresh_ahead = refresh_ahead
+        self.min_hits = min_hits
+        self.max_tracked = max_tracked
+        self.tasks: Dict[str, asyncio.Task] = {}
+        # key -> reads since its last refresh
+        self.hits: Dict[str, int] = {}
+        self.completed = 0
+        self.failed = 0
+
+    def record_hit(self, key: str):
+        if key not in self.hits and len(self.hits) >= self.max_tracked:
+            # Popularity is only a hint; start counting afresh rather than grow unbounded
+            self.hits.clear()
+        self.hits[key] = self.hits.get(key, 0) + 1
+
+    def should_refresh(self, key: str, expires_in: float) -> bool:
+        """Stale entries always refresh; fresh ones only when popular and close to expiry"""
+        if expires_in <= 0:
+            return True
+        return expires_in <= self.refresh_ahead and self.hits.get(key, 0) >= self.min_hits
+
+    def schedule(self, key: str, fn: Callable[[], Awaitable[Any]]) -> bool:
+        """Start fn() in the background unless a refresh for key is already running"""
+        if key in self.tasks:
+            return False
+        self.tasks[key] = asyncio.create_task(self._run(key, fn))
+        return True
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]):
+        try:
+            await fn()
+            self.completed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"⚠️ Background refresh failed for {key}: {str(e)}")
+        finally:
+            self.tasks.pop(key, None)
+            self.hits.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "running": len(self.tasks),
+            "tracked_keys": len(self.hits),
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+    def cancel_all(self):
+        for task in self.tasks.values():
+            task.cancel()
+
+tiktok_refresher = BackgroundRefresher(
+    refresh_ahead=float(os.getenv("TIKTOK_REFRESH_AHEAD_SECONDS", "120")),
+    min_hits=int(os.getenv("TIKTOK_REFRESH_AHEAD_MIN_HITS", "3"))
+)
+
+class ScrapeBackoff:
+    """
+    Negative cache for scrapes that fail or come back empty.
+    
+    Each consecutive miss doubles how long the key is skipped, from base_ttl
+    up to max_ttl. A key's miss count is forgotten once it has gone max_ttl
+    past its last backoff without another miss, or as soon as a scrape succeeds.
+    """
+    def __init__(self, name: str, base_ttl: int = 300, max_ttl: int = 21600, max_entries: int = 5000):
+        self.base_ttl = base_ttl
+        self.max_ttl = max_ttl
+        # {key} -> (consecutive misses, retry_at timestamp, last reason)
+        self.cache = LRUCache(name, max_entries=max_entries, default_ttl=max_ttl)
+        self.skipped = 0
+
+    def backoff_for(self, failures: int) -> float:
+        return min(self.base_ttl * (2 ** (failures - 1)), self.max_ttl)
+
+    def retry_in(self, key: str) -> Optional[float]:
+        """Seconds until key may be scraped again, or None if it is not backing off"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        remaining = entry[1] - time.time()
+        if remaining <= 0:
+            return None
+        self.skipped += 1
+        return remaining
+
+    def record_miss(self, key: str, reason: str) -> float:
+        entry = self.cache.get(key)
+        failures = (entry[0] if entry else 0) + 1
+        backoff = self.backoff_for(failures)
+        self.cache.set(key, (failures, time.time() + backoff, reason), ttl=backoff + self.max_ttl)
+        return backoff
+
+    def record_success(self, key: str):
+        self.cache.delete(key)
+
+    def active(self) -> List[Dict[str, Any]]:
+        """Keys currently backing off, soonest retry first"""
+        now = time.time()
+        backing_off = [
+            {
+                "key": key,
+                "failures": failures,
+                "retry_in_seconds": round(retry_at - now),
+                "reason": reason
+            }
+            for key, ((failures, retry_at, reason), _, _) in self.cache.entries.items()
+            if retry_at > now
+        ]
+        return sorted(backing_off, key=lambda entry: entry["retry_in_seconds"])
+
+    def stats(self) -> Dict[str, int]:
+        return {"tracked": len(self.cache.entries), "backing_off": len(self.active()), "skipped": self.skipped}
+
+# Places TikTok keeps returning nothing for, keyed by place_id
+tiktok_backoff = ScrapeBackoff(
+    "tiktok_backoff",
+    base_ttl=int(os.getenv("TIKTOK_NEGATIVE_TTL_SECONDS", "300")),
+    max_ttl=int(os.getenv("TIKTOK_NEGATIVE_MAX_TTL_SECONDS", "21600"))
+)
+
+# ==================== BROWSER POOL FOR PLAYWRIGHT ====================
+BROWSER_LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+# Elastic pool bounds; the pool starts at the minimum
+BROWSER_POOL_MIN = int(os.getenv("BROWSER_POOL_MIN", "1"))
+BROWSER_POOL_MAX = int(os.getenv("BROWSER_POOL_MAX", "4"))
+
+def host_available_memory_bytes() -> Optional[int]:
+    """MemAvailable from /proc/meminfo (None where unavailable)"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+class BrowserAcquireTimeout(Exception):
+    """Raised when no pooled browser frees up within the acquire timeout"""
+
+def process_rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of a process from /proc (None where unavailable)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+class BrowserSlot:
+    """Bookkeeping for one pooled browser"""
+    __slots__ = ("browser", "launched_at", "contexts", "rss_bytes", "recycle_reason", "warm")
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.launched_at = time.time()
+        self.contexts = 0
+        self.rss_bytes: Optional[int] = None
+        # Set by the health monitor to drain the browser at its next hand-off
+        self.recycle_reason: Optional[str] = None
+        # Ready-to-use page prepared by the pool's warmup hook (see ScrapePagePool)
+        self.warm: Optional[Any] = None
+
+class BrowserPool:
+    """
+    Reusable browser instances to avoid startup overhead, kept healthy.
+    
+    Browsers are checked on every hand-off: dead ones are relaunched, and
+    ones that have served max_contexts contexts, lived max_age seconds or
+    been flagged by the memory monitor are closed and replaced. A background
+    monitor samples each browser's RSS (all its Chromium processes) and
+    flags any over max_rss_bytes. acquire() raises BrowserAcquireTimeout
+    instead of waiting forever.
+    
+    With min_size < max_size the pool is elastic: an autoscaler adds a
+    browser when work is backing up (waiters here plus backlog_fn(), e.g. the
+    scrape job queue) and has been waiting too long - by the p95 of finished
+    acquires, the age of the oldest acquire still waiting, or how long the
+    pool has been saturated with a backlog - and the host has memory to
+    spare. It removes idle browsers after a quiet period or under memory
+    pressure. Separate up/down cooldowns keep it from flapping.
+    
+    warmup(browser), if given, runs after every launch and its result is
+    kept on the browser's slot (used to keep a configured page ready).
+    """
+    def __init__(
+        self,
+        pool_size: int = 2,
+        max_contexts: int = 200,
+        max_age: float = 1800.0,
+        max_rss_bytes: Optional[int] = None,
+        acquire_timeout: float = 30.0,
+        health_interval: float = 60.0,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        backlog_fn: Optional[Callable[[], int]] = None,
+        scale_interval: float = 5.0,
+        scale_up_wait: float = 2.0,
+        scale_up_cooldown: float = 30.0,
+        scale_down_idle: float = 300.0,
+        min_free_memory_bytes: int = 300 * 1024 * 1024,
+        warmup: Optional[Callable[[Any], Awaitable[Any]]] = None
+    ):
+        self.pool_size = pool_size
+        self.min_size = min_size if min_size is not None else pool_size
+        self.max_size = max(max_size if max_size is not None else pool_size, self.min_size)
+        self.backlog_fn = backlog_fn
+        self.scale_interval = scale_interval
+        self.scale_up_wait = scale_up_wait
+        self.scale_up_cooldown = scale_up_cooldown
+        self.scale_down_idle = scale_down_idle
+        self.min_free_memory_bytes = min_free_memory_bytes
+        self.warmup = warmup
+        # Browsers the pool is meant to hold (idle + checked out + relaunching)
+        self.target_size = pool_size
+        # ticket -> start time for every acquire() still waiting
+        self.pending_acquires: Dict[object, float] = {}
+        # When the pool was last seen fully busy with work backed up
+        self.saturated_since: Optional[float] = None
+        # (timestamp, seconds waited) for recent acquires
+        self.acquire_waits: deque = deque(maxlen=200)
+        self.last_acquire = time.time()
+        self.last_scale = 0.0
+        self.decisions: deque = deque(maxlen=20)
+        self.scaler_task: Optional[asyncio.Task] = None
+        self.max_contexts = max_contexts
+        self.max_age = max_age
+        self.max_rss_bytes = max_rss_bytes
+        self.acquire_timeout = acquire_timeout
+        self.health_interval = health_interval
+        self.browsers: asyncio.Queue = None
+        self.playwright = None
+        # id(browser) -> BrowserSlot, for idle and checked-out browsers alike
+        self.slots: Dict[int, BrowserSlot] = {}
+        self.background_tasks: set = set()
+        self.monitor_task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.counters = {
+            "launched": 0, "recycled": 0, "launch_failures": 0, "acquire_timeouts": 0,
+            "scale_ups": 0, "scale_downs": 0
+        }
+    
+    async def initialize(self):
+        """Initialize the browser pool"""
+        self.playwright = await async_playwright().start()
+        self.browsers = asyncio.Queue()
+        
+        for _ in range(self.pool_size):
+            await self.browsers.put(await self._launch())
+        
+        self.monitor_task = asyncio.create_task(self._monitor())
+        if self.max_size > self.min_size:
+            self.scaler_task = asyncio.create_task(self._autoscale())
+        logger.info(f"🚀 Browser pool initialized with {self.pool_size} instances (min {self.min_size}, max {self.max_size})")
+    
+    async def _launch(self):
+        try:
+            browser = await self.playwright.chromium.launch(headless=True, args=BROWSER_LAUNCH_ARGS)
+        except Exception:
+            self.counters["launch_failures"] += 1
+            raise
+        slot = BrowserSlot(browser)
+        self.slots[id(browser)] = slot
+        self.counters["launched"] += 1
+        if self.warmup:
+            try:
+                slot.warm = await self.warmup(browser)
+            except Exception as e:
+                logger.warning(f"⚠️ Browser warmup failed: {str(e)}")
+        return browser
+    
+    async def _retire(self, browser, reason: str):
+        self.slots.pop(id(browser), None)
+        self.counters["recycled"] += 1
+        logger.info(f"♻️ Recycling browser: {reason}")
+        try:
+            await browser.close()
+        except Exception:
+            pass
+    
+    def _recycle_reason(self, browser) -> Optional[str]:
+        slot = self.slots.get(id(browser))
+        if slot is None:
+            return "untracked"
+        if not browser.is_connected():
+            return "disconnected"
+        if slot.recycle_reason:
+            return slot.recycle_reason
+        if slot.contexts >= self.max_contexts:
+            return f"served {slot.contexts} contexts"
+        if time.time() - slot.launched_at >= self.max_age:
+            return f"older than {self.max_age:.0f}s"
+        return None
+    
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+    
+    async def _relaunch_into_pool(self):
+        """Launch a browser into the pool, retrying until it works or the pool closes"""
+        delay = 1.0
+        while not self.closed:
+            try:
+                await self.browsers.put(await self._launch())
+                return
+            except Exception as e:
+                logger.error(f"❌ Browser relaunch failed, retrying in {delay:.0f}s: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+    
+    @property
+    def waiters(self) -> int:
+        return len(self.pending_acquires)
+    
+    def oldest_wait(self) -> float:
+        """Seconds the longest-waiting acquire() has been blocked so far"""
+        if not self.pending_acquires:
+            return 0.0
+        return time.time() - min(self.pending_acquires.values())
+    
+    async def acquire(self):
+        """Get a healthy browser from the pool"""
+        started = time.time()
+        self.last_acquire = started
+        ticket = object()
+        self.pending_acquires[ticket] = started
+        try:
+            browser = await asyncio.wait_for(self.browsers.get(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.counters["acquire_timeouts"] += 1
+            self.acquire_waits.append((time.time(), self.acquire_timeout))
+            raise BrowserAcquireTimeout(f"No browser available within {self.acquire_timeout:g}s")
+        finally:
+            del self.pending_acquires[ticket]
+        self.acquire_waits.append((time.time(), time.time() - started))
+        
+        reason = self._recycle_reason(browser)
+        if reason:
+            await self._retire(browser, reason)
+            try:
+                browser = await self._launch()
+            except Exception:
+                # Keep the pool at capacity even though this caller goes without
+                self._spawn(self._relaunch_into_pool())
+                raise
+        
+        self.slots[id(browser)].contexts += 1
+        logger.info(f"🎭 Browser acquired from pool")
+        return browser
+    
+    async def release(self, browser):
+        """Return a browser to the pool (replacing it if it's due for recycling)"""
+        if len(self.slots) > self.target_size:
+            # The pool was scaled down while this browser was checked out
+            self._spawn(self._retire(browser, "pool scaled down"))
+            return
+        reason = self._recycle_reason(browser)
+        if reason:
+            # Replace off the caller's path; the slot stays counted via the relaunch
+            self._spawn(self._retire(browser, reason))
+            self._spawn(self._relaunch_into_pool())
+            return
+        await self.browsers.put(browser)
+        logger.info(f"🔄 Browser returned to pool")
+    
+    async def _sample_rss(self, browser) -> Optional[int]:
+        """Sum RSS over the browser's processes, found through CDP"""
+        try:
+            session = await browser.new_browser_cdp_session()
+            try:
+                info = await session.send("SystemInfo.getProcessInfo")
+            finally:
+                await session.detach()
+        except Exception:
+            return None
+        sizes = [process_rss_bytes(process["id"]) for process in info.get("processInfo", [])]
+        sizes = [size for size in sizes if size]
+        return sum(sizes) if sizes else None
+    
+    async def _monitor(self):
+        """Background task: sample memory and flag dead or bloated browsers"""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for slot in list(self.slots.values()):
+                if not slot.browser.is_connected():
+                    slot.recycle_reason = "disconnected"
+                    continue
+                slot.rss_bytes = await self._sample_rss(slot.browser)
+                if self.max_rss_bytes and slot.rss_bytes and slot.rss_bytes > self.max_rss_bytes and not slot.recycle_reason:
+                    slot.recycle_reason = f"RSS {slot.rss_bytes // (1024 * 1024)} MB over ceiling"
+                    logger.warning(f"🐘 Browser flagged for recycling: {slot.recycle_reason}")
+    
+    def recent_wait_p95(self, window: float = 60.0) -> float:
+        """95th percentile acquire wait over the last window seconds"""
+        cutoff = time.time() - window
+        waits = sorted(wait for at, wait in self.acquire_waits if at >= cutoff)
+        return waits[int(0.95 * (len(waits) - 1))] if waits else 0.0
+    
+    def _record_decision(self, action: str, new_size: int, reason: str):
+        self.decisions.append({
+            "at": time.time(),
+            "action": action,
+            "from": self.target_size,
+            "to": new_size,
+            "reason": reason
+        })
+        logger.info(f"📈 Browser pool {action} {self.target_size} -> {new_size}: {reason}")
+        self.target_size = new_size
+        self.last_scale = time.time()
+    
+    async def _scale_up(self, reason: str):
+        self._record_decision("scale_up", self.target_size + 1, reason)
+        self.counters["scale_ups"] += 1
+        self._spawn(self._relaunch_into_pool())
+    
+    async def _scale_down(self, reason: str):
+        self._record_decision("scale_down", self.target_size - 1, reason)
+        self.counters["scale_downs"] += 1
+        try:
+            browser = self.browsers.get_nowait()
+        except asyncio.QueueEmpty:
+            # All checked out; release() retires the first one to come back
+            return
+        await self._retire(browser, reason)
+    
+    async def autoscale_once(self):
+        """Make at most one scaling decision from current demand and memory"""
+        now = time.time()
+        backlog = self.waiters + (self.backlog_fn() if self.backlog_fn else 0)
+        # Finished acquires only show waits after the fact, so also count
+        # callers still blocked and work queued behind a fully busy pool
+        if backlog > 0 and self.browsers.qsize() == 0:
+            self.saturated_since = self.saturated_since or now
+        else:
+            self.saturated_since = None
+        wait_p95 = self.recent_wait_p95()
+        wait = max(wait_p95, self.oldest_wait(), now - self.saturated_since if self.saturated_since else 0.0)
+        free_memory = host_available_memory_bytes()
+        memory_low = free_memory is not None and free_memory < self.min_free_memory_bytes
+        
+        if memory_low and self.target_size > self.min_size:
+            await self._scale_down(f"host memory low ({free_memory // (1024 * 1024)} MB free)")
+            return
+        
+        if (
+            self.target_size < self.max_size
+            and backlog > 0
+            and wait >= self.scale_up_wait
+            and not memory_low
+            and now - self.last_scale >= self.scale_up_cooldown
+        ):
+            await self._scale_up(
+                f"{backlog} waiting ({self.waiters} on acquire), waited {wait:.1f}s "
+                f"(p95 {wait_p95:.1f}s, oldest {self.oldest_wait():.1f}s)"
+            )
+            return
+        
+        if (
+            self.target_size > self.min_size
+            and backlog == 0
+            and now - self.last_acquire >= self.scale_down_idle
+            and now - self.last_scale >= self.scale_down_idle
+        ):
+            await self._scale_down(f"idle for {now - self.last_acquire:.0f}s")
+    
+    async def _autoscale(self):
+        """Background task: resize the pool between min_size and max_size"""
+        while True:
+            await asyncio.sleep(self.scale_interval)
+            try:
+                await self.autoscale_once()
+            except Exception as e:
+                logger.error(f"❌ Browser pool autoscaling failed: {str(e)}")
+    
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "size": len(self.slots),
+            "target_size": self.target_size,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "waiters": self.waiters,
+            "oldest_wait_seconds": round(self.oldest_wait(), 3),
+            "acquire_wait_p95_seconds": round(self.recent_wait_p95(), 3),
+            "host_available_mb": (host_available_memory_bytes() or 0) // (1024 * 1024),
+            "decisions": list(self.decisions),
+            "idle": self.browsers.qsize() if self.browsers else 0,
+            "browsers": [
+                {
+                    "age_seconds": round(now - slot.launched_at),
+                    "contexts": slot.contexts,
+                    "rss_mb": round(slot.rss_bytes / (1024 * 1024), 1) if slot.rss_bytes else None,
+                    "recycle_reason": slot.recycle_reason
+                }
+                for slot in self.slots.values()
+            ],
+            **self.counters
+        }
+    
+    async def close(self):
+        """Close all browsers"""
+        self.closed = True
+        for task in (self.monitor_task, self.scaler_task):
+            if task:
+                task.cancel()
+        for task in list(self.background_tasks):
+            task.cancel()
+        
+        for slot in list(self.slots.values()):
+            try:
+                await slot.browser.close()
+            except Exception:
+                pass
+        self.slots.clear()
+        
+        if self.playwright:
+            await self.playwright.stop()
+        
+        logger.info("🛑 Browser pool closed")
+
+# Global browser pool instance
+browser_pool: Optional[BrowserPool] = None
+
+# ==================== UPSTREAM RESILIENCE POLICIES ====================
+class CircuitOpenError(Exception):
+    """Raised when an upstream's circuit breaker is rejecting calls"""
+    def __init__(self, upstream_name: str, retry_in: float):
+        super().__init__(f"{upstream_name} circuit open (retry in {retry_in:.0f}s)")
+        self.upstream_name = upstream_name
+        self.retry_in = retry_in
+
+class UpstreamPolicy:
+    """
+    Per-upstream call policy: timeout, jittered retries capped by a retry
+    budget, a circuit breaker with half-open probing and optional hedging.
+    
+    Failures are exceptions, timeouts and HTTP 429/5xx responses. Other 4xx
+    responses are returned to the caller untouched. neutral_errors are
+    local conditions that say nothing about the upstream's health; they are
+    re-raised without counting as a success or a failure.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        retry_budget_ratio: float = 0.2,
+        retry_budget_max: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+        neutral_errors: tuple = (),
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Retry budget: each call deposits retry_budget_ratio tokens, each retry/hedge spends one
+        self.retry_budget_ratio = retry_budget_ratio
+        self.retry_budget_max = retry_budget_max
+        self.retry_tokens = retry_budget_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.neutral_errors = neutral_errors
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.latencies: deque = deque(maxlen=200)
+        self.counters = {
+            "calls": 0, "successes": 0, "failures": 0, "retries": 0,
+            "hedges": 0, "hedge_wins": 0, "rejected": 0, "budget_exhausted": 0
+        }
+
+    # ---- circuit breaker ----
+    def _before_call(self):
+        if self.state == self.OPEN:
+            elapsed = time.time() - self.opened_at
+            if elapsed < self.reset_timeout:
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+            self.state = self.HALF_OPEN
+            logger.info(f"🔌 {self.name} circuit half-open, probing")
+        if self.state == self.HALF_OPEN:
+            if self.probe_in_flight:
+                self.counters["rejected"] += 1
+                raise CircuitOpenError(self.name, 0)
+            self.probe_in_flight = True
+
+    def _record_success(self, latency: float):
+        self.latencies.append(latency)
+        self.counters["successes"] += 1
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+        if self.state != self.CLOSED:
+            logger.info(f"✅ {self.name} circuit closed")
+        self.state = self.CLOSED
+
+    def _record_failure(self):
+        self.counters["failures"] += 1
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"🚨 {self.name} circuit OPEN after {self.consecutive_failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.time()
+
+    # ---- retry budget ----
+    def _spend_retry_token(self) -> bool:
+        if self.retry_tokens >= 1:
+            self.retry_tokens -= 1
+            return True
+        self.counters["budget_exhausted"] += 1
+        return False
+
+    def p95_latency(self) -> Optional[float]:
+        if len(self.latencies) < self.hedge_min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    @staticmethod
+    def _is_failure_response(result: Any) -> bool:
+        return isinstance(result, httpx.Response) and (result.status_code == 429 or result.status_code >= 500)
+
+    async def _attempt(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        return await asyncio.wait_for(fn(), timeout=self.timeout)
+
+    async def _hedged_attempt(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Start a second attempt if the first hasn't answered by the p95 latency"""
+        hedge_delay = self.p95_latency()
+        primary = asyncio.ensure_future(self._attempt(fn))
+        if hedge_delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done or not self._spend_retry_token():
+            return await primary
+
+        self.counters["hedges"] += 1
+        hedge = asyncio.ensure_future(self._attempt(fn))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and not self._is_failure_response(task.result()):
+                        if task is hedge:
+                            self.counters["hedge_wins"] += 1
+                        return task.result()
+            # Both failed: surface the primary's outcome
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if not task.done():
+                    task.cancel()
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], idempotent: bool = True, hedge: Optional[bool] = None) -> Any:
+        """
+        Run fn() under this policy.
+        
+        Args:
+            fn: Factory producing a fresh awaitable per attempt
+            idempotent: Only idempotent calls are retried or hedged
+            hedge: Override the policy's hedging setting for this call
+            
+        Raises:
+            CircuitOpenError if the breaker is open
+        """
+        self._before_call()
+        self.counters["calls"] += 1
+        self.retry_tokens = min(self.retry_budget_max, self.retry_tokens + self.retry_budget_ratio)
+
+        attempt = 0
+        while True:
+            start = time.time()
+            try:
+                if idempotent and (self.hedge if hedge is None else hedge):
+                    result = await self._hedged_attempt(fn)
+                else:
+                    result = await self._attempt(fn)
+                failed = self._is_failure_response(result)
+                error = None
+            except asyncio.CancelledError:
+                self.probe_in_flight = False
+                raise
+            except self.neutral_errors:
+                self.probe_in_flight = False
+                raise
+            except Exception as e:
+                failed, result, error = True, None, e
+
+            if not failed:
+                self._record_success(time.time() - start)
+                return result
+
+            can_retry = (
+                idempotent
+                and attempt < self.max_retries
+                and self.state != self.HALF_OPEN
+                and self._spend_retry_token()
+            )
+            if not can_retry:
+                self._record_failure()
+                if error is not None:
+                    raise error
+                return result
+
+            attempt += 1
+            self.counters["retries"] += 1
+            # Full jitter exponential backoff
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+            logger.warning(f"🔁 Retrying {self.name} (attempt {attempt + 1}) in {delay:.2f}s: {error or result.status_code}")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.p95_latency()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_tokens": round(self.retry_tokens, 2),
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+            **self.counters
+        }
+
+# One policy per upstream dependency
+upstream_policies: Dict[str, UpstreamPolicy] = {
+    "places": UpstreamPolicy("places", timeout=10.0, max_retries=2, hedge=True),
+    "geocoding": UpstreamPolicy("geocoding", timeout=5.0, max_retries=2, hedge=True),
+    # Every SerpApi call is billed, and a timed-out one keeps running on its
+    # thread, so no retries (SerpApiClient also bounds the request itself)
+    "serpapi": UpstreamPolicy("serpapi", timeout=20.0, max_retries=0),
+    "google_html": UpstreamPolicy("google_html", timeout=10.0, max_retries=1),
+    # Scrapes are too expensive to retry; the breaker still sheds load when TikTok is down,
+    # but a saturated browser pool isn't TikTok's fault
+    "tiktok": UpstreamPolicy(
+        "tiktok", timeout=60.0, max_retries=0, failure_threshold=3, reset_timeout=120.0,
+        neutral_errors=(BrowserAcquireTimeout,)
+    ),
+}
+
+# ==================== ASYNC UPSTREAM HTTP CLIENT ====================
+PLACES_API_BASE = "https://places.googleapis.com/v1"
+GEOCODE_API_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+# Field mask shared by every Nearby/Text Search call
+PLACES_SEARCH_FIELD_MASK = "places.id,places.displayName,places.formattedAddress,places.location,places.types,places.rating,places.userRatingCount,places.priceLevel,places.photos"
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class UpstreamClient:
+    """Shared non-blocking HTTP client for Google Places and other upstream calls"""
+    def __init__(
+        self,
+        timeout: float = float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", "10")),
+        connect_timeout: float = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT_SECONDS", "5")),
+        max_connections: int = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100")),
+        max_keepalive: int = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20")),
+    ):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=60.0,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Lazily create the pooled client so it binds to the running event loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=self.limits,
+                follow_redirects=True,
+            )
+            logger.info(f"🌐 Upstream HTTP client ready (http2={HTTP2_AVAILABLE})")
+        return self._client
+
+    @staticmethod
+    def places_headers(field_mask: str) -> Dict[str, str]:
+        """Single construction point for Places API (New) request headers"""
+        return {
+            "Content-Type": "application/json",
+            "X-Goog-Api-Key": GOOGLE_API_KEY or "",
+            "X-Goog-FieldMask": field_mask,
+        }
+
+    async def get(self, url: str, timeout: Optional[float] = None, policy: Optional[str] = None, **kwargs) -> httpx.Response:
+        """GET through the named upstream policy (if any)"""
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        if policy is None:
+            return await self.client.get(url, **kwargs)
+        return await upstream_policies[policy].call(lambda: self.client.get(url, **kwargs))
+
+    async def post(self, url: str, timeout: Optional[float] = None, policy: Optional[str] = None, **kwargs) -> httpx.Response:
+        """POST through the named upstream policy (if any); never hedged"""
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        if policy is None:
+            return await self.client.post(url, **kwargs)
+        # Places searches are read-only, so retries are safe; hedging stays GET-only
+        return await upstream_policies[policy].call(lambda: self.client.post(url, **kwargs), hedge=False)
+
+    async def places_get(
+        self,
+        place_id: str,
+        field_mask: str,
+        timeout: Optional[float] = None,
+        session_token: Optional[str] = None
+    ) -> httpx.Response:
+        """GET places/{place_id} with the given field mask (a session token concludes an autocomplete session)"""
+        return await self.get(
+            f"{PLACES_API_BASE}/places/{place_id}",
+            params={"sessionToken": session_token} if session_token else None,
+            headers=self.places_headers(field_mask),
+            timeout=timeout,
+            policy="places",
+        )
+
+    async def places_post(self, method: str, body: Dict[str, Any], field_mask: str, timeout: Optional[float] = None) -> httpx.Response:
+        """POST to a Places collection method such as 'places:searchNearby'"""
+        return await self.post(
+            f"{PLACES_API_BASE}/{method}",
+            json=body,
+            headers=self.places_headers(field_mask),
+            timeout=timeout,
+            policy="places",
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        logger.info("🛑 Upstream HTTP client closed")
+
+# Global upstream client instance
+upstream = UpstreamClient()
+
+# ==================== SINGLE-FLIGHT REQUEST COALESCING ====================
+class SingleFlight:
+    """Coalesce concurrent identical async operations onto one in-flight task"""
     def __init__(self):
-        self.cache: Dict[str, tuple] = {}
-    
-    def get(self, key: str) -> Optional[List[Dict]]:
-        if key in self.cache:
-            data, expiry = self.cache[key]
-            if datetime.now() < expiry:
-                logger.info(f"🎯 Cache HIT for {key}")
-                return data
+        self.inflight: Dict[str, asyncio.Task] = {}
+        # namespace -> {"executed": n, "deduplicated": n}
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, namespace: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() unless an identical operation is already in flight, in which
+        case wait for and share its result (or exception).
+        """
+        flight_key = f"{namespace}:{key}"
+        counters = self.counters.setdefault(namespace, {"executed": 0, "deduplicated": 0})
+
+        task = self.inflight.get(flight_key)
+        if task is not None:
+            counters["deduplicated"] += 1
+            logger.info(f"🤝 Coalesced duplicate {namespace} request")
+        else:
+            counters["executed"] += 1
+            task = asyncio.ensure_future(fn())
+            self.inflight[flight_key] = task
+            task.add_done_callback(lambda t: self._forget(flight_key, t))
+
+        # Shield so one cancelled caller doesn't cancel the work for everyone else
+        return await asyncio.shield(task)
+
+    def _forget(self, flight_key: str, task: asyncio.Task):
+        if self.inflight.get(flight_key) is task:
+            del self.inflight[flight_key]
+        # Mark the exception as retrieved when every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self.inflight), "namespaces": self.counters}
+
+# Global single-flight group shared by Places, SerpApi and TikTok lookups
+single_flight = SingleFlight()
+
+async def places_search(method: str, body: Dict[str, Any], field_mask: str = PLACES_SEARCH_FIELD_MASK) -> httpx.Response:
+    """POST a Places search, coalescing identical concurrent searches"""
+    key = f"{method}:{field_mask}:{json.dumps(body, sort_keys=True)}"
+    return await single_flight.do("places_search", key, lambda: upstream.places_post(method, body, field_mask))
+
+# ==================== FIELD-MASK-AWARE PLACE DETAILS CACHE ====================
+# Fields every detail-screen endpoint needs between them. A single-place miss
+# fetches this superset so the follow-up calls for the same place hit the cache.
+PLACE_DETAILS_PREFETCH_FIELDS = "id,displayName,formattedAddress,location,types,rating,priceLevel,photos,reviews"
+
+def parse_field_mask(field_mask: str) -> set:
+    """Split a comma-separated Places field mask into a set of field names"""
+    return {field.strip() for field in field_mask.split(",") if field.strip()}
+
+class PlaceDetailsCache:
+    """TTL cache of Place Details keyed by place_id, tracking which fields each entry holds"""
+    def __init__(self, ttl: int = 900, max_entries: int = 5000):
+        self.ttl = ttl
+        # place:{place_id} -> (data, sorted fields fetched, expiry); lists so it round-trips through JSON
+        self.cache = LRUCache(
+            "place_details",
+            max_entries=max_entries,
+            namespace_ttls={"place": ttl},
+            persistent=True
+        )
+        self.hits = 0
+        self.misses = 0
+
+    async def load(self, place_id: str):
+        """Read the entry back from the disk tier if it isn't in memory"""
+        await self.cache.load(f"place:{place_id}")
+
+    def get(self, place_id: str, fields: set) -> Optional[Dict[str, Any]]:
+        """Return the requested fields if the cached entry covers all of them"""
+        entry = self.cache.get(f"place:{place_id}")
+        if entry is None:
+            self.misses += 1
+            return None
+
+        data, cached_fields, _ = entry
+        if not fields <= set(cached_fields):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._project(data, fields)
+
+    @staticmethod
+    def _project(data: Dict[str, Any], fields: set) -> Dict[str, Any]:
+        # Google omits empty fields, so only project what the entry actually has
+        return {field: data[field] for field in fields if field in data}
+
+    def cached_fields(self, place_id: str) -> set:
+        """Fields held by a live entry (empty if absent or expired)"""
+        entry = self.cache.get(f"place:{place_id}")
+        return set(entry[1]) if entry is not None else set()
+
+    def merge(self, place_id: str, data: Dict[str, Any], fields: set) -> Dict[str, Any]:
+        """Merge freshly fetched fields into the entry and return the merged data (a live entry keeps its expiry)"""
+        cached_data, cached_fields = {}, set()
+        expiry = time.time() + self.ttl
+        entry = self.cache.get(f"place:{place_id}")
+        if entry is not None:
+            cached_data, cached_fields, expiry = dict(entry[0]), set(entry[1]), entry[2]
+
+        # Fields requested but absent from the response are known-empty; drop stale values
+        for field in fields:
+            cached_data.pop(field, None)
+        cached_data.update(data)
+
+        self.cache.set(
+            f"place:{place_id}",
+            (cached_data, sorted(cached_fields | fields), expiry),
+            ttl=max(expiry - time.time(), 0)
+        )
+        return self._project(cached_data, cached_fields | fields)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self.cache.entries), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        self.cache.clear()
+
+# Global place details cache instance
+place_details_cache = PlaceDetailsCache(ttl=int(os.getenv("PLACE_DETAILS_CACHE_TTL", "900")))
+
+# Autocomplete session tokens already concluded by a Place Details call
+concluded_sessions = LRUCache(
+    "autocomplete_sessions",
+    max_entries=int(os.getenv("AUTOCOMPLETE_SESSIONS_MAX_ENTRIES", "10000")),
+    default_ttl=3600
+)
+
+async def get_place_details(
+    place_id: str,
+    field_mask: str,
+    prefetch: bool = True,
+    session_token: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get Place Details through the shared cache.
+
+    Args:
+        place_id: Google place ID
+        field_mask: Comma-separated fields the caller needs
+        prefetch: Widen a miss to PLACE_DETAILS_PREFETCH_FIELDS so sibling
+            detail-screen endpoints are served locally
+        session_token: Autocomplete session to conclude. The first call for a
+            token always goes upstream with the requested fields, even when
+            the cache could answer it, since Google only closes (and bills
+            the keystrokes as) a session when a Details call carries its token
+
+    Returns:
+        Dict containing (at most) the requested fields
+
+    Raises:
+        httpx.HTTPError if the upstream lookup fails
+    """
+    fields = parse_field_mask(field_mask) | {"id"}
+    concludes_session = bool(session_token) and concluded_sessions.get(session_token) is None
+    await place_details_cache.load(place_id)
+    if not concludes_session:
+        cached = place_details_cache.get(place_id, fields)
+        if cached is not None:
+            return cached
+
+    # Only fetch the fields the entry is missing, widened to the prefetch superset
+    fetch_fields = set(fields)
+    if prefetch:
+        fetch_fields |= parse_field_mask(PLACE_DETAILS_PREFETCH_FIELDS)
+    if not concludes_session:
+        fetch_fields -= place_details_cache.cached_fields(place_id)
+    fetch_fields |= {"id"}
+
+    fetch_mask = ",".join(sorted(fetch_fields))
+
+    async def fetch() -> Dict[str, Any]:
+        response = await upstream.places_get(
+            place_id, fetch_mask, session_token=session_token if concludes_session else None
+        )
+        response.raise_for_status()
+        if concludes_session:
+            concluded_sessions.set(session_token, True)
+        return place_details_cache.merge(place_id, response.json(), fetch_fields)
+
+    # Each session needs its own concluding call, so the token is part of the key
+    flight_key = f"{place_id}:{fetch_mask}:{session_token}" if concludes_session else f"{place_id}:{fetch_mask}"
+    merged = await single_flight.do("place_details", flight_key, fetch)
+    return {field: merged[field] for field in fields if field in merged}
+
+# ==================== GEO-TILE SEARCH RESULT CACHE ====================
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_M = 6371000
+
+def geohash_encode(lat: float, lng: float, precision: int) -> str:
+    """Encode a coordinate as a geohash string of the given precision"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, bit_count, even = [], 0, 0, True
+    while len(geohash) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(geohash)
+
+def geohash_decode(geohash: str) -> tuple:
+    """Decode a geohash into (center_lat, center_lng, lat_half_height, lng_half_width)"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
             else:
-                del self.cache[key]  # Expired
-                logger.info(f"⏰ Cache EXPIRED for {key}")
-        return None
+                rng[1] = mid
+            even = not even
+    return (
+        (lat_range[0] + lat_range[1]) / 2,
+        (lng_range[0] + lng_range[1]) / 2,
+        (lat_range[1] - lat_range[0]) / 2,
+        (lng_range[1] - lng_range[0]) / 2,
+    )
+
+def geohash_neighbors(geohash: str) -> List[str]:
+    """Return the geohash itself plus its 8 surrounding tiles"""
+    lat, lng, lat_half, lng_half = geohash_decode(geohash)
+    tiles = []
+    for dlat in (-2, 0, 2):
+        for dlng in (-2, 0, 2):
+            tile = geohash_encode(
+                max(-90.0, min(90.0, lat + dlat * lat_half)),
+                (lng + dlng * lng_half + 180) % 360 - 180,
+                len(geohash)
+            )
+            if tile not in tiles:
+                tiles.append(tile)
+    return tiles
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two coordinates in meters"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+def place_within_radius(place: Dict[str, Any], lat: float, lng: float, radius: float) -> bool:
+    location = place.get("location") or {}
+    if "latitude" not in location or "longitude" not in location:
+        return False
+    return haversine_m(lat, lng, location["latitude"], location["longitude"]) <= radius
+
+class GeoTileCache:
+    """
+    TTL cache of Places search results keyed by geohash tile and query signature.
     
-    def set(self, key: str, data: List[Dict], ttl: int = 600):
-        """TTL in seconds (default 10 minutes)"""
-        expiry = datetime.now() + timedelta(seconds=ttl)
-        self.cache[key] = (data, expiry)
-        logger.info(f"💾 Cache SET for {key} (expires in {ttl}s)")
+    Searches are re-centered on their tile and, for Nearby Search, widened by one
+    tile diagonal, so a cached entry covers every circle of the same radius whose
+    center lies within that margin. Lookups check the center tile and its
+    neighbours and re-filter the cached places on distance.
     
+    A widened search is only stored when it came back under the result cap;
+    otherwise its top results aren't a superset of the requested circle's. Such
+    dense tiles are remembered and searched with the exact radius instead
+    (center snapped), and those entries are only served for their own tile.
+    """
+    def __init__(self, precision: int = 7, ttl: int = 600, max_entries: int = 2000):
+        self.precision = precision
+        self.ttl = ttl
+        # geo:{tile}:{signature} -> (places, center_lat, center_lng, coverage_radius, exact, capped)
+        # dense:{tile}:{signature} -> True when the widened search hit the cap
+        self.cache = LRUCache("geo_tiles", max_entries=max_entries, default_ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def tile_for(self, lat: float, lng: float) -> str:
+        return geohash_encode(lat, lng, self.precision)
+
+    def tile_margin_m(self, tile: str) -> float:
+        """Full diagonal of a tile in meters"""
+        lat, lng, lat_half, lng_half = geohash_decode(tile)
+        return haversine_m(lat - lat_half, lng - lng_half, lat + lat_half, lng + lng_half)
+
+    def lookup(self, signature: str, lat: float, lng: float, radius: float, refilter: bool) -> Optional[tuple]:
+        """
+        Find a live entry that covers the requested circle.
+        
+        Args:
+            refilter: Nearby (restricted) searches may be served from any
+                covering tile and are re-filtered on distance; biased Text
+                Search results are only served from the exact tile.
+        
+        Returns:
+            (places, capped) where capped means the upstream response hit the
+            result cap, or None on a miss
+        """
+        tile = self.tile_for(lat, lng)
+        tiles = geohash_neighbors(tile) if refilter else [tile]
+
+        for candidate in tiles:
+            entry = self.cache.get(f"geo:{candidate}:{signature}")
+            if entry is None:
+                continue
+            places, center_lat, center_lng, coverage, exact, capped = entry
+            if exact:
+                # Center snapped but not widened: only valid for its own tile
+                if candidate != tile:
+                    continue
+            elif refilter:
+                if haversine_m(center_lat, center_lng, lat, lng) + radius > coverage:
+                    continue
+                places = [p for p in places if place_within_radius(p, lat, lng, radius)]
+            self.hits += 1
+            logger.info(f"🗺️ Geo-tile cache HIT ({candidate}, {len(places)} places)")
+            # Shallow copies: handlers annotate places in place
+            return [dict(p) for p in places], capped
+
+        self.misses += 1
+        return None
+
+    def store(
+        self,
+        signature: str,
+        tile: str,
+        places: List[Dict],
+        center_lat: float,
+        center_lng: float,
+        coverage: float,
+        exact: bool = False,
+        capped: bool = False
+    ):
+        self.cache.set(f"geo:{tile}:{signature}", (places, center_lat, center_lng, coverage, exact, capped))
+
+    def is_dense(self, signature: str, tile: str) -> bool:
+        return self.cache.get(f"dense:{tile}:{signature}") is not None
+
+    def mark_dense(self, signature: str, tile: str):
+        self.cache.set(f"dense:{tile}:{signature}", True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self.cache.entries), "hits": self.hits, "misses": self.misses}
+
     def clear(self):
         self.cache.clear()
-        logger.info("🧹 Cache CLEARED")
 
-# Global TikTok cache instance
-tiktok_cache = SimpleCache()
+# Global geo-tile cache instance
+geo_tile_cache = GeoTileCache(
+    precision=int(os.getenv("GEO_TILE_PRECISION", "7")),
+    ttl=int(os.getenv("GEO_TILE_CACHE_TTL", "600"))
+)
 
-# ==================== BROWSER POOL FOR PLAYWRIGHT ====================
-class BrowserPool:
-    """Reusable browser instances to avoid startup overhead"""
-    def __init__(self, pool_size: int = 2):
-        self.pool_size = pool_size
-        self.browsers: asyncio.Queue = None
-        self.playwright = None
-    
-    async def initialize(self):
-        """Initialize the browser pool"""
-        self.playwright = await async_playwright().start()
-        self.browsers = asyncio.Queue(maxsize=self.pool_size)
-        
-        for _ in range(self.pool_size):
-            browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=[
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-gpu",
-                    "--no-first-run",
-                    "--no-default-browser-check",
-                ]
-            )
-            await self.browsers.put(browser)
-        
-        logger.info(f"🚀 Browser pool initialized with {self.pool_size} instances")
+# ==================== IN-MEMORY SPATIAL INDEX OF SEEN PLACES ====================
+class PlaceSpatialIndex:
+    """
+    Geohash-bucketed index of every place returned by a search.
     
-    async def acquire(self):
-        """Get a browser from the pool"""
-        browser = await self.browsers.get()
-        logger.info(f"🎭 Browser acquired from pool")
-        return browser
+    Nearby Search responses that came back below maxResultCount are complete for
+    their circle, so those circles are recorded as coverage per includedTypes.
+    Radius/bounding-box queries inside fresh coverage are answered locally.
     
-    async def release(self, browser):
-        """Return a browser to the pool"""
-        await self.browsers.put(browser)
-        logger.info(f"🔄 Browser returned to pool")
+    Places older than max_age are pruned on insert (at most once per
+    prune_interval), and the least recently refreshed places are evicted
+    once the index holds more than max_places.
+    """
+    def __init__(
+        self,
+        bucket_precision: int = 5,
+        coverage_ttl: int = 1800,
+        max_age: int = 86400,
+        max_coverage: int = 5000,
+        max_places: int = 50000,
+        prune_interval: int = 60
+    ):
+        self.bucket_precision = bucket_precision
+        self.coverage_ttl = coverage_ttl
+        self.max_age = max_age
+        self.max_coverage = max_coverage
+        self.max_places = max_places
+        self.prune_interval = prune_interval
+        self.last_pruned = time.time()
+        self.evictions = 0
+        # bucket geohash -> {place_id: (place, inserted_at, updated_at)}
+        self.buckets: Dict[str, Dict[str, tuple]] = {}
+        # place_id -> bucket geohash
+        self.place_buckets: Dict[str, str] = {}
+        # (types key, center_lat, center_lng, radius, covered_at)
+        self.coverage: List[tuple] = []
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def types_key(included_types: List[str]) -> str:
+        return ",".join(sorted(included_types or []))
+
+    def upsert(self, places: List[Dict[str, Any]]):
+        """Insert or refresh places, moving them between buckets if their location changed"""
+        now = time.time()
+        for place in places:
+            place_id = place.get("id")
+            location = place.get("location") or {}
+            if not place_id or "latitude" not in location or "longitude" not in location:
+                continue
+
+            bucket = geohash_encode(location["latitude"], location["longitude"], self.bucket_precision)
+            inserted_at = now
+            previous_bucket = self.place_buckets.get(place_id)
+            if previous_bucket is not None:
+                previous = self.buckets.get(previous_bucket, {}).pop(place_id, None)
+                if previous is not None:
+                    inserted_at = previous[1]
+
+            self.buckets.setdefault(bucket, {})[place_id] = (dict(place), inserted_at, now)
+            self.place_buckets[place_id] = bucket
+
+        if len(self.place_buckets) > self.max_places or now - self.last_pruned >= self.prune_interval:
+            self.prune(now)
+
+    def _remove(self, place_id: str):
+        bucket = self.place_buckets.pop(place_id, None)
+        places = self.buckets.get(bucket)
+        if places is None:
+            return
+        places.pop(place_id, None)
+        if not places:
+            del self.buckets[bucket]
+
+    def prune(self, now: Optional[float] = None):
+        """Drop places older than max_age, then the stalest ones beyond max_places"""
+        now = now or time.time()
+        self.last_pruned = now
+        cutoff = now - self.max_age
+        expired = [
+            place_id
+            for places in self.buckets.values()
+            for place_id, (_, _, updated_at) in places.items()
+            if updated_at < cutoff
+        ]
+        for place_id in expired:
+            self._remove(place_id)
+
+        overflow = len(self.place_buckets) - self.max_places
+        if overflow > 0:
+            # Evict down to 90% so a full index isn't re-sorted on every insert
+            overflow += self.max_places // 10
+            by_age = sorted(
+                (updated_at, place_id)
+                for places in self.buckets.values()
+                for place_id, (_, _, updated_at) in places.items()
+            )
+            for _, place_id in by_age[:overflow]:
+                self._remove(place_id)
+            self.evictions += overflow
+
+    def mark_covered(self, included_types: List[str], lat: float, lng: float, radius: float):
+        """Record that every matching place within the circle is in the index as of now"""
+        self.coverage.append((self.types_key(included_types), lat, lng, radius, time.time()))
+        if len(self.coverage) > self.max_coverage:
+            self.coverage = self.coverage[-self.max_coverage:]
+
+    def is_covered(self, included_types: List[str], lat: float, lng: float, radius: float) -> bool:
+        key = self.types_key(included_types)
+        cutoff = time.time() - self.coverage_ttl
+        self.coverage = [c for c in self.coverage if c[4] >= cutoff]
+        return any(
+            c[0] == key and haversine_m(c[1], c[2], lat, lng) + radius <= c[3]
+            for c in self.coverage
+        )
+
+    def _buckets_in_bbox(self, south: float, west: float, north: float, east: float) -> set:
+        """Geohash buckets overlapping a bounding box"""
+        _, _, lat_half, lng_half = geohash_decode(geohash_encode(south, west, self.bucket_precision))
+        buckets = set()
+        lat = south
+        while True:
+            lng = west
+            while True:
+                buckets.add(geohash_encode(min(lat, north), min(lng, east), self.bucket_precision))
+                if lng >= east:
+                    break
+                lng += lng_half * 2
+            if lat >= north:
+                break
+            lat += lat_half * 2
+        return buckets
+
+    def _scan(self, buckets: set, included_types: List[str], price_level: Optional[str], predicate: Callable[[Dict], bool]) -> List[Dict]:
+        cutoff = time.time() - self.max_age
+        matches = []
+        for bucket in buckets:
+            for place, _, updated_at in self.buckets.get(bucket, {}).values():
+                if updated_at < cutoff:
+                    continue
+                if included_types and not set(included_types) & set(place.get("types", [])):
+                    continue
+                if price_level and place.get("priceLevel") != price_level:
+                    continue
+                if predicate(place):
+                    matches.append(dict(place))
+        # Mirror Nearby Search's popularity ranking
+        matches.sort(key=lambda p: p.get("userRatingCount", 0), reverse=True)
+        return matches
+
+    def query_circle(
+        self,
+        lat: float,
+        lng: float,
+        radius: float,
+        included_types: List[str],
+        price_level: Optional[str] = None,
+        max_results: int = 20
+    ) -> Optional[List[Dict]]:
+        """Places within the circle, or None if the circle isn't freshly covered"""
+        if not self.is_covered(included_types, lat, lng, radius):
+            self.misses += 1
+            return None
+
+        dlat = math.degrees(radius / EARTH_RADIUS_M)
+        dlng = math.degrees(radius / (EARTH_RADIUS_M * max(math.cos(math.radians(lat)), 1e-6)))
+        buckets = self._buckets_in_bbox(lat - dlat, lng - dlng, lat + dlat, lng + dlng)
+        places = self._scan(buckets, included_types, price_level, lambda p: place_within_radius(p, lat, lng, radius))
+
+        self.hits += 1
+        logger.info(f"🧭 Spatial index HIT ({len(places)} places within {radius}m)")
+        return places[:max_results]
+
+    def query_bbox(
+        self,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        included_types: List[str],
+        price_level: Optional[str] = None,
+        max_results: int = 20
+    ) -> Optional[List[Dict]]:
+        """Places within the bounding box, or None if its enclosing circle isn't freshly covered"""
+        center_lat, center_lng = (south + north) / 2, (west + east) / 2
+        radius = haversine_m(center_lat, center_lng, north, east)
+        if not self.is_covered(included_types, center_lat, center_lng, radius):
+            self.misses += 1
+            return None
+
+        buckets = self._buckets_in_bbox(south, west, north, east)
+        places = self._scan(
+            buckets, included_types, price_level,
+            lambda p: place_in_bbox(p, south, west, north, east)
+        )
+
+        self.hits += 1
+        logger.info(f"🧭 Spatial index HIT ({len(places)} places in viewport)")
+        return places[:max_results]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "places": len(self.place_buckets),
+            "buckets": len(self.buckets),
+            "coverage_circles": len(self.coverage),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def clear(self):
+        self.buckets.clear()
+        self.place_buckets.clear()
+        self.coverage.clear()
+
+def place_in_bbox(place: Dict[str, Any], south: float, west: float, north: float, east: float) -> bool:
+    location = place.get("location") or {}
+    if "latitude" not in location or "longitude" not in location:
+        return False
+    return south <= location["latitude"] <= north and west <= location["longitude"] <= east
+
+# Global spatial index instance
+place_index = PlaceSpatialIndex(
+    coverage_ttl=int(os.getenv("PLACE_INDEX_COVERAGE_TTL", "1800")),
+    max_age=int(os.getenv("PLACE_INDEX_MAX_AGE", "86400")),
+    max_places=int(os.getenv("PLACE_INDEX_MAX_PLACES", "50000"))
+)
+
+# Places API hard limit on search circle radius
+PLACES_MAX_RADIUS_M = 50000
+
+async def geo_cached_places_search(method: str, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Run a Nearby/Text Search through the geo-tile cache.
     
-    async def close(self):
-        """Close all browsers"""
-        while not self.browsers.empty():
-            browser = await self.browsers.get()
-            await browser.close()
+    Args:
+        method: 'places:searchNearby' or 'places:searchText'
+        body: Request body with a locationRestriction or locationBias circle
         
-        if self.playwright:
-            await self.playwright.stop()
+    Returns:
+        List of places for the requested circle
         
-        logger.info("🛑 Browser pool closed")
+    Raises:
+        httpx.HTTPError if the upstream search fails
+    """
+    places, _ = await geo_cached_places_lookup(method, body)
+    return places
 
-# Global browser pool instance
-browser_pool: Optional[BrowserPool] = None
+async def geo_cached_places_lookup(method: str, body: Dict[str, Any]) -> tuple:
+    """
+    Same as geo_cached_places_search, but also reports whether the upstream
+    response behind the result hit maxResultCount (taken from the raw count,
+    before re-filtering to the requested circle).
+    
+    Returns:
+        (places, capped)
+    """
+    restricted = "locationRestriction" in body
+    circle = (body.get("locationRestriction") or body.get("locationBias"))["circle"]
+    lat = circle["center"]["latitude"]
+    lng = circle["center"]["longitude"]
+    radius = circle["radius"]
+
+    # Everything except the location identifies the query (types, text, price, radius)
+    signature = json.dumps(
+        {
+            "method": method,
+            "radius": radius,
+            **{k: v for k, v in body.items() if k not in ("locationRestriction", "locationBias")}
+        },
+        sort_keys=True
+    )
+
+    cached = geo_tile_cache.lookup(signature, lat, lng, radius, refilter=restricted)
+    if cached is not None:
+        return cached
+
+    included_types = body.get("includedTypes", [])
+    max_results = body.get("maxResultCount", 20)
+    if restricted:
+        local = place_index.query_circle(lat, lng, radius, included_types, max_results=max_results)
+        if local is not None:
+            return local, len(local) >= max_results
+
+    # Snap the query to the tile center so nearby users share the entry
+    tile = geo_tile_cache.tile_for(lat, lng)
+    tile_lat, tile_lng, _, _ = geohash_decode(tile)
+
+    async def search_tile_circle(coverage: float) -> List[Dict[str, Any]]:
+        tile_body = json.loads(json.dumps(body))
+        tile_circle = (tile_body.get("locationRestriction") or tile_body.get("locationBias"))["circle"]
+        tile_circle["center"] = {"latitude": tile_lat, "longitude": tile_lng}
+        tile_circle["radius"] = coverage
+
+        response = await places_search(method, tile_body)
+        response.raise_for_status()
+        places = response.json().get("places", [])
+        place_index.upsert(places)
+        return places
+
+    if restricted and not geo_tile_cache.is_dense(signature, tile):
+        coverage = min(radius + geo_tile_cache.tile_margin_m(tile), PLACES_MAX_RADIUS_M)
+        places = await search_tile_circle(coverage)
+        # A Nearby Search that didn't hit the result cap returned everything in
+        # the widened circle, so re-filtering it gives the exact answer
+        if len(places) < max_results:
+            geo_tile_cache.store(signature, tile, places, tile_lat, tile_lng, coverage)
+            place_index.mark_covered(included_types, tile_lat, tile_lng, coverage)
+            return [dict(p) for p in places if place_within_radius(p, lat, lng, radius)], False
+
+        logger.info(f"🗺️ Geo-tile {tile} is dense, searching the exact radius")
+        geo_tile_cache.mark_dense(signature, tile)
+
+    places = await search_tile_circle(radius)
+    capped = len(places) >= max_results
+    geo_tile_cache.store(signature, tile, places, tile_lat, tile_lng, radius, exact=True, capped=capped)
+    if restricted and not capped:
+        place_index.mark_covered(included_types, tile_lat, tile_lng, radius)
+    return [dict(p) for p in places], capped
 
 # Pydantic models for request validation
 class FilterOptions(BaseModel):
@@ -199,7 +2403,94 @@ if not SERPAPI_KEY:
 else:
     logger.info(f"✅ SERPAPI_KEY loaded (length: {len(SERPAPI_KEY)})")
 
-# Configure CORS
+# ==================== CONDITIONAL GET (ETAG / 304) ====================
+# (path pattern, Cache-Control max-age in seconds); first match wins. Each
+# max-age is capped at the TTL of the cache the route is served from, since
+# a 304 from etag_cache vouches for the data without looking at that cache
+CONDITIONAL_GET_ROUTES = [
+    (re.compile(r"^/restaurants/search$"), min(300, geo_tile_cache.ttl)),
+    (re.compile(r"^/restaurants/[^/]+/reviews$"), min(1800, place_details_cache.ttl)),
+    (re.compile(r"^/restaurants/[^/]+/menu-photos$"), min(3600, place_details_cache.ttl)),
+    (re.compile(r"^/restaurants/(?!search$|viewport$|photo$)[^/]+$"), min(3600, place_details_cache.ttl)),
+]
+
+# {path}?{query} -> ETag last served for it; while an entry is live the
+# response is known not to have changed, so matching requests skip the handler
+etag_cache = LRUCache(
+    "etags",
+    max_entries=int(os.getenv("ETAG_CACHE_MAX_ENTRIES", "20000"))
+)
+
+def conditional_get_max_age(path: str) -> Optional[int]:
+    for pattern, max_age in CONDITIONAL_GET_ROUTES:
+        if pattern.match(path):
+            return max_age
+    return None
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Compare weakly, as RFC 9110 requires for If-None-Match
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+def is_error_payload(body: bytes) -> bool:
+    """Whether a JSON body is an {"error": ...} fallback rather than real data"""
+    if b'"error"' not in body:
+        return False
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and "error" in payload
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """
+    Add ETag/Cache-Control to read endpoints and answer If-None-Match with 304.
+    
+    If the client's tag matches the one recorded for this exact URL within
+    max-age, the 304 goes out without running the handler, so neither the
+    upstream fetch nor serialization happens. Otherwise the handler runs and
+    the tag is a hash of the serialized body. Payloads carrying a top-level
+    "error" are sent with no-store and never tagged.
+    """
+    max_age = conditional_get_max_age(request.url.path) if request.method == "GET" else None
+    if max_age is None:
+        return await call_next(request)
+
+    cache_control = f"public, max-age={max_age}"
+    key = f"{request.url.path}?{request.url.query}"
+    if_none_match = request.headers.get("if-none-match")
+
+    known_etag = etag_cache.get(key)
+    if known_etag and etag_matches(if_none_match, known_etag):
+        return Response(status_code=304, headers={"ETag": known_etag, "Cache-Control": cache_control})
+
+    response = await call_next(request)
+    if response.status_code != 200 or not response.headers.get("content-type", "").startswith("application/json"):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = {
+        name: value for name, value in response.headers.items()
+        if name.lower() not in ("content-length", "etag", "cache-control")
+    }
+
+    if is_error_payload(body):
+        headers["Cache-Control"] = "no-store"
+        return Response(content=body, status_code=200, headers=headers)
+
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    etag_cache.set(key, etag, ttl=max_age)
+    headers.update({"ETag": etag, "Cache-Control": cache_control})
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return Response(content=body, status_code=200, headers=headers)
+
+# Configure CORS (registered last so it wraps every other middleware, 304s included)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -268,38 +2559,239 @@ async def debug_routes():
         })
     return {"routes": routes}
 
+@app.get("/debug/upstreams")
+async def debug_upstreams():
+    """Report circuit breaker, retry budget and hedging state per upstream"""
+    return {name: policy.stats() for name, policy in upstream_policies.items()}
+
+@app.get("/debug/tiktok-backoff")
+async def debug_tiktok_backoff():
+    """List places whose TikTok scrapes are in negative-cache backoff"""
+    return {"places": tiktok_backoff.active()}
+
+@app.get("/debug/tiktok-jobs")
+async def debug_tiktok_jobs():
+    """Report TikTok scrape queue depth, worker count and job states"""
+    return tiktok_jobs.stats()
+
+@app.get("/debug/browser-pool")
+async def debug_browser_pool():
+    """Report browser pool size, per-browser age/usage/memory and recycling counters"""
+    if browser_pool is None:
+        return {"size": 0}
+    return {**browser_pool.stats(), "pages": scrape_pages.stats()}
+
+@app.get("/debug/cache")
+async def debug_cache():
+    """Report cache statistics"""
+    return {
+        "engines": {name: cache.stats() for name, cache in cache_registry.items()},
+        "persistent": await persistent_cache.run(persistent_cache.stats) if persistent_cache else None,
+        "shared": shared_cache.stats(),
+        "serpapi": serpapi_client.stats(),
+        "autocomplete": autocomplete_cache.stats(),
+        "gazetteer": gazetteer.stats() if gazetteer else None,
+        "tiktok_refresh": tiktok_refresher.stats(),
+        "tiktok_backoff": tiktok_backoff.stats(),
+        "place_details": place_details_cache.stats(),
+        "geo_tiles": geo_tile_cache.stats(),
+        "place_index": place_index.stats(),
+        "single_flight": single_flight.stats()
+    }
+
 # Add this helper function to generate proper photo URLs
 def get_photo_url(photo_reference: str, max_width: int = 400) -> str:
     """Generate a proper Google Places photo URL"""
     if not photo_reference:
         return None
     
-    # For the Places API v1, use this format
-    # photo_reference should be in the format "places/{place_id}/photos/{photo_id}"
-    if photo_reference.startswith("places/"):
-        return f"https://places.googleapis.com/v1/{photo_reference}/media?maxHeightPx={max_width}&key={GOOGLE_API_KEY}"
-    else:
-        # Legacy format for backward compatibility
-        return f"https://maps.googleapis.com/maps/api/place/photo?maxwidth={max_width}&photo_reference={photo_reference}&key={GOOGLE_API_KEY}"
+    # For the Places API v1, use this format
+    # photo_reference should be in the format "places/{place_id}/photos/{photo_id}"
+    if photo_reference.startswith("places/"):
+        return f"https://places.googleapis.com/v1/{photo_reference}/media?maxHeightPx={max_width}&key={GOOGLE_API_KEY}"
+    else:
+        # Legacy format for backward compatibility
+        return f"https://maps.googleapis.com/maps/api/place/photo?maxwidth={max_width}&photo_reference={photo_reference}&key={GOOGLE_API_KEY}"
+
+# Helper function to process photos in place data
+def process_place_photos(places: list) -> list:
+    """Process photos in a list of places to generate proper URLs"""
+    for place in places:
+        if "photos" in place and place["photos"]:
+            processed_photos = []
+            for photo in place["photos"]:
+                if "name" in photo:
+                    photo_url = get_photo_url(photo["name"])
+                    if photo_url:
+                        processed_photos.append({
+                            "name": photo["name"],
+                            "googleMapsUri": photo_url,
+                            "widthPx": photo.get("widthPx", 400),
+                            "heightPx": photo.get("heightPx", 300)
+                        })
+            place["photos"] = processed_photos
+    return places
+
+# Price level (1-4) to Google Places API enum values
+PRICE_LEVEL_MAP = {
+    1: "PRICE_LEVEL_INEXPENSIVE",
+    2: "PRICE_LEVEL_MODERATE",
+    3: "PRICE_LEVEL_EXPENSIVE",
+    4: "PRICE_LEVEL_VERY_EXPENSIVE"
+}
+
+def build_restaurant_search(
+    lat: float,
+    lng: float,
+    radius: int,
+    keyword: str,
+    price_level: Optional[int],
+    venue_type: Optional[str]
+) -> tuple:
+    """
+    Pick the Places search method and body for a restaurant search.
+    CRITICAL: Matcha requires Text Search because Nearby Search can't filter by keyword.
+    Coffee and Cafe can use Nearby Search with includedTypes for efficiency.
+    
+    Returns:
+        (method, body) where method is 'places:searchText' or 'places:searchNearby'
+    """
+    # CASE 1: Matcha filter - MUST use Text Search with textQuery
+    if venue_type and venue_type.lower() == "matcha":
+        logger.info(f"🍵 Using Text Search for matcha venues")
+        # Text Search with "matcha cafe" query and locationBias (not locationRestriction)
+        # locationBias prioritizes nearby results but allows relevant matches slightly outside radius
+        body = {
+            "textQuery": "matcha cafe",
+            "locationBias": {
+                "circle": {
+                    "center": {
+                        "latitude": lat,
+                        "longitude": lng
+                    },
+                    "radius": radius
+                }
+            },
+            "maxResultCount": 20
+        }
+
+        logger.info(f"📤 Calling Text Search API with query: 'matcha cafe'")
+        return "places:searchText", body
+
+    # CASE 2: Coffee or Cafe filter - use Nearby Search with includedTypes
+    elif venue_type and venue_type.lower() in ["coffee", "cafe"]:
+        included_types = ["coffee_shop"] if venue_type.lower() == "coffee" else ["cafe"]
+        logger.info(f"☕ Using Nearby Search for {venue_type} venues")
+        logger.info(f"📋 Using includedTypes: {included_types}")
+
+        body = {
+            "locationRestriction": {
+                "circle": {
+                    "center": {
+                        "latitude": lat,
+                        "longitude": lng
+                    },
+                    "radius": radius
+                }
+            },
+            "includedTypes": included_types,
+            "maxResultCount": 20
+        }
+
+        return "places:searchNearby", body
+
+    # CASE 3: Keyword filter (cuisine/dietary) without venue_type - use Text Search
+    elif keyword:
+        logger.info(f"🔍 Using Text Search with query: '{keyword}'")
+        body = {
+            "textQuery": keyword,
+            "locationBias": {
+                "circle": {
+                    "center": {
+                        "latitude": lat,
+                        "longitude": lng
+                    },
+                    "radius": radius
+                }
+            }
+        }
+
+        if price_level:
+            body["priceLevels"] = [PRICE_LEVEL_MAP.get(price_level, "PRICE_LEVEL_INEXPENSIVE")]
+
+        return "places:searchText", body
+
+    # CASE 4: Default - use Nearby Search for restaurants
+    else:
+        logger.info(f"📍 Using Nearby Search for restaurants")
+        body = {
+            "locationRestriction": {
+                "circle": {
+                    "center": {
+                        "latitude": lat,
+                        "longitude": lng
+                    },
+                    "radius": radius
+                }
+            },
+            "includedTypes": ["restaurant"],
+            "maxResultCount": 20
+        }
+
+        return "places:searchNearby", body
+
+
+def filter_matcha_venues(places: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep cafes/tea houses whose name mentions matcha or green tea"""
+    logger.info(f"🍵 Filtering results for matcha-related venues...")
+    matcha_keywords = ["matcha", "green tea", "japanese tea", "tea house"]
+    filtered_matcha = []
+
+    for place in places:
+        place_name = place.get("displayName", {}).get("text", "").lower()
+        place_types = place.get("types", [])
+
+        # Check if name contains matcha-related keywords
+        has_matcha_keyword = any(keyword in place_name for keyword in matcha_keywords)
+
+        # Check if it's a cafe or tea-related establishment
+        is_cafe = "cafe" in place_types or "tea_house" in place_types
+
+        if has_matcha_keyword and is_cafe:
+            filtered_matcha.append(place)
+            logger.info(f"✅ Matched matcha venue: {place_name}")
+
+    logger.info(f"🍵 Found {len(filtered_matcha)} matcha venues after filtering")
+    return filtered_matcha
+
+
+def matches_service_filters(place: Dict[str, Any], service_filters: Dict[str, Optional[bool]]) -> bool:
+    """
+    Check a detailed place against the requested service attributes.
+    
+    Args:
+        place: Place Details including service attribute fields
+        service_filters: outdoor_seating / pet_friendly / wheelchair_accessible /
+            delivery_available flags; None means "don't care"
+    """
+    # Check outdoor seating
+    if service_filters.get("outdoor_seating") and not place.get("outdoorSeating", False):
+        return False
+    
+    # Check pet friendly (Places API exposes allowsDogs)
+    if service_filters.get("pet_friendly") and not place.get("allowsDogs", False):
+        return False
+    
+    # Check wheelchair accessible
+    if service_filters.get("wheelchair_accessible") and not place.get("accessibilityOptions", {}).get("wheelchairAccessibleEntrance", False):
+        return False
+    
+    # Check delivery available
+    if service_filters.get("delivery_available") and not place.get("delivery", False):
+        return False
+    
+    return True
 
-# Helper function to process photos in place data
-def process_place_photos(places: list) -> list:
-    """Process photos in a list of places to generate proper URLs"""
-    for place in places:
-        if "photos" in place and place["photos"]:
-            processed_photos = []
-            for photo in place["photos"]:
-                if "name" in photo:
-                    photo_url = get_photo_url(photo["name"])
-                    if photo_url:
-                        processed_photos.append({
-                            "name": photo["name"],
-                            "googleMapsUri": photo_url,
-                            "widthPx": photo.get("widthPx", 400),
-                            "heightPx": photo.get("heightPx", 300)
-                        })
-            place["photos"] = processed_photos
-    return places
 
 # Update the restaurants endpoint to include proper photo URLs
 @app.get("/restaurants/search")
@@ -326,11 +2818,6 @@ async def search_restaurants(
     try:
         logger.info(f"🔍 Searching restaurants at ({lat}, {lng}) with radius {radius}m")
         
-        # Determine search strategy based on venue_type
-        # CRITICAL: Matcha requires Text Search because Nearby Search can't filter by keyword
-        # Coffee and Cafe can use Nearby Search with includedTypes for efficiency
-        use_text_search_for_matcha = venue_type and venue_type.lower() == "matcha"
-        
         # Service attributes that require Place Details API
         service_filters = {
             "outdoor_seating": outdoor_seating,
@@ -352,166 +2839,14 @@ async def search_restaurants(
         keyword = " ".join(keywords).strip()
         
         # Step 1: Initial search using appropriate API endpoint
-        
-        # CASE 1: Matcha filter - MUST use Text Search with textQuery
-        if use_text_search_for_matcha:
-            logger.info(f"🍵 Using Text Search for matcha venues")
-            # Text Search with "matcha cafe" query and locationBias (not locationRestriction)
-            # locationBias prioritizes nearby results but allows relevant matches slightly outside radius
-            body = {
-                "textQuery": "matcha cafe",
-                "locationBias": {
-                    "circle": {
-                        "center": {
-                            "latitude": lat,
-                            "longitude": lng
-                        },
-                        "radius": radius
-                    }
-                },
-                "maxResultCount": 20
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": GOOGLE_API_KEY,
-                "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.location,places.types,places.rating,places.userRatingCount,places.priceLevel,places.photos"
-            }
-            
-            logger.info(f"📤 Calling Text Search API with query: 'matcha cafe'")
-            response = requests.post(
-                "https://places.googleapis.com/v1/places:searchText",
-                json=body,
-                headers=headers
-            )
-        
-        # CASE 2: Coffee or Cafe filter - use Nearby Search with includedTypes
-        elif venue_type and venue_type.lower() in ["coffee", "cafe"]:
-            included_types = ["coffee_shop"] if venue_type.lower() == "coffee" else ["cafe"]
-            logger.info(f"☕ Using Nearby Search for {venue_type} venues")
-            logger.info(f"📋 Using includedTypes: {included_types}")
-            
-            body = {
-                "locationRestriction": {
-                    "circle": {
-                        "center": {
-                            "latitude": lat,
-                            "longitude": lng
-                        },
-                        "radius": radius
-                    }
-                },
-                "includedTypes": included_types,
-                "maxResultCount": 20
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": GOOGLE_API_KEY,
-                "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.location,places.types,places.rating,places.userRatingCount,places.priceLevel,places.photos"
-            }
-            
-            response = requests.post(
-                "https://places.googleapis.com/v1/places:searchNearby",
-                json=body,
-                headers=headers
-            )
-        
-        # CASE 3: Keyword filter (cuisine/dietary) without venue_type - use Text Search
-        elif keyword:
-            logger.info(f"🔍 Using Text Search with query: '{keyword}'")
-            body = {
-                "textQuery": keyword,
-                "locationBias": {
-                    "circle": {
-                        "center": {
-                            "latitude": lat,
-                            "longitude": lng
-                        },
-                        "radius": radius
-                    }
-                }
-            }
-            
-            # Map price_level (1-4) to Google Places API enum values
-            if price_level:
-                price_level_map = {
-                    1: "PRICE_LEVEL_INEXPENSIVE",
-                    2: "PRICE_LEVEL_MODERATE",
-                    3: "PRICE_LEVEL_EXPENSIVE",
-                    4: "PRICE_LEVEL_VERY_EXPENSIVE"
-                }
-                body["priceLevels"] = [price_level_map.get(price_level, "PRICE_LEVEL_INEXPENSIVE")]
-            
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": GOOGLE_API_KEY,
-                "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.location,places.types,places.rating,places.userRatingCount,places.priceLevel,places.photos"
-            }
-            
-            response = requests.post(
-                "https://places.googleapis.com/v1/places:searchText",
-                json=body,
-                headers=headers
-            )
-        
-        # CASE 4: Default - use Nearby Search for restaurants
-        else:
-            logger.info(f"📍 Using Nearby Search for restaurants")
-            body = {
-                "locationRestriction": {
-                    "circle": {
-                        "center": {
-                            "latitude": lat,
-                            "longitude": lng
-                        },
-                        "radius": radius
-                    }
-                },
-                "includedTypes": ["restaurant"],
-                "maxResultCount": 20
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": GOOGLE_API_KEY,
-                "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.location,places.types,places.rating,places.userRatingCount,places.priceLevel,places.photos"
-            }
-            
-            response = requests.post(
-                "https://places.googleapis.com/v1/places:searchNearby",
-                json=body,
-                headers=headers
-            )
-        
-        response.raise_for_status()
-        data = response.json()
-        places = data.get("places", [])
+        method, body = build_restaurant_search(lat, lng, radius, keyword, price_level, venue_type)
+        places = await geo_cached_places_search(method, body)
         
         logger.info(f"✅ Initial search found {len(places)} places")
         
         # Step 1.5: Filter by name for matcha venues (post-processing)
         if venue_type and venue_type.lower() == "matcha":
-            logger.info(f"🍵 Filtering results for matcha-related venues...")
-            matcha_keywords = ["matcha", "green tea", "japanese tea", "tea house"]
-            filtered_matcha = []
-            
-            for place in places:
-                place_name = place.get("displayName", {}).get("text", "").lower()
-                place_types = place.get("types", [])
-                
-                # Check if name contains matcha-related keywords
-                has_matcha_keyword = any(keyword in place_name for keyword in matcha_keywords)
-                
-                # Check if it's a cafe or tea-related establishment
-                is_cafe = "cafe" in place_types or "tea_house" in place_types
-                
-                if has_matcha_keyword and is_cafe:
-                    filtered_matcha.append(place)
-                    logger.info(f"✅ Matched matcha venue: {place_name}")
-            
-            places = filtered_matcha
-            logger.info(f"🍵 Found {len(places)} matcha venues after filtering")
+            places = filter_matcha_venues(places)
         
         # Step 2: Filter by service attributes if needed
         if needs_details_filtering and places:
@@ -522,36 +2857,11 @@ async def search_restaurants(
             detailed_places = await fetch_place_details_batch(place_ids)
             
             # Filter based on service attributes
-            filtered_places = []
-            for place in detailed_places:
-                include = True
-                
-                # Check outdoor seating
-                if outdoor_seating is not None:
-                    has_outdoor = place.get("outdoorSeating", False)
-                    if outdoor_seating and not has_outdoor:
-                        include = False
-                
-                # Check pet friendly (using good_for_children as proxy since pet_friendly not in API)
-                if pet_friendly is not None:
-                    is_pet_friendly = place.get("allowsDogs", False)
-                    if pet_friendly and not is_pet_friendly:
-                        include = False
-                
-                # Check wheelchair accessible
-                if wheelchair_accessible is not None:
-                    is_accessible = place.get("accessibilityOptions", {}).get("wheelchairAccessibleEntrance", False)
-                    if wheelchair_accessible and not is_accessible:
-                        include = False
-                
-                # Check delivery available
-                if delivery_available is not None:
-                    has_delivery = place.get("delivery", False)
-                    if delivery_available and not has_delivery:
-                        include = False
-                
-                if include:
-                    filtered_places.append(place)
+            # Places whose details could not be fetched can't be verified
+            filtered_places = [
+                place for place in detailed_places
+                if "error" not in place and matches_service_filters(place, service_filters)
+            ]
             
             logger.info(f"✅ Filtered to {len(filtered_places)} restaurants with service attributes")
             
@@ -566,13 +2876,7 @@ async def search_restaurants(
         
         # Apply price filter if provided and no service filtering needed
         if price_level and not needs_details_filtering:
-            price_level_map = {
-                1: "PRICE_LEVEL_INEXPENSIVE",
-                2: "PRICE_LEVEL_MODERATE",
-                3: "PRICE_LEVEL_EXPENSIVE",
-                4: "PRICE_LEVEL_VERY_EXPENSIVE"
-            }
-            target_price = price_level_map.get(price_level)
+            target_price = PRICE_LEVEL_MAP.get(price_level)
             places = [p for p in places if p.get("priceLevel") == target_price]
             logger.info(f"💰 Filtered by price level {price_level}: {len(places)} results")
         
@@ -593,45 +2897,240 @@ async def search_restaurants(
         
     except Exception as e:
         logger.error(f"❌ Error searching restaurants: {str(e)}")
-        logger.error(f"Response content: {response.text if 'response' in locals() else 'No response'}")
+        logger.error(f"Response content: {e.response.text if isinstance(e, httpx.HTTPStatusError) else 'No response'}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# Helper function to fetch place details in batch
-async def fetch_place_details_batch(place_ids: List[str]) -> List[Dict[str, Any]]:
-    """Fetch place details for multiple place IDs"""
-    detailed_places = []
-    
-    # Field mask for service attributes
-    field_mask = (
-        "id,displayName,formattedAddress,location,types,rating,userRatingCount,priceLevel,photos,"
-        "outdoorSeating,allowsDogs,accessibilityOptions,delivery,dineIn,reservable,servesBeer,"
-        "servesWine,servesVegetarianFood"
-    )
+# ==================== PAGINATED STREAMING SEARCH ====================
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+def format_stream_record(record: Dict[str, Any], format: str = "ndjson") -> str:
+    """Serialize one streamed record as an NDJSON line or an SSE event named after its type"""
+    payload = json.dumps(record)
+    if format == "sse":
+        return f"event: {record.get('type', 'message')}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+# Text Search stops handing out page tokens after 60 results
+TEXT_SEARCH_MAX_RESULTS = 60
+# Nearby Search has no page tokens; the circle is split into 7 sub-circles instead
+NEARBY_TILED_MAX_RESULTS = 140
+
+def tile_search_circle(lat: float, lng: float, radius: float) -> List[tuple]:
+    """
+    Cover a circle with 7 circles of half its radius: one at the center and
+    six on a hexagonal ring at radius * sqrt(3) / 2.
     
-    headers = {
-        "Content-Type": "application/json",
-        "X-Goog-Api-Key": GOOGLE_API_KEY,
-        "X-Goog-FieldMask": field_mask
-    }
+    Returns:
+        List of (lat, lng, radius) sub-circles
+    """
+    sub_radius = radius / 2
+    ring = radius * math.sqrt(3) / 2
+    circles = [(lat, lng, sub_radius)]
+    for i in range(6):
+        bearing = math.radians(60 * i)
+        dlat = math.degrees(ring * math.cos(bearing) / EARTH_RADIUS_M)
+        dlng = math.degrees(ring * math.sin(bearing) / (EARTH_RADIUS_M * max(math.cos(math.radians(lat)), 1e-6)))
+        circles.append((lat + dlat, lng + dlng, sub_radius))
+    return circles
+
+async def iter_search_pages(method: str, body: Dict[str, Any], limit: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield pages of search results as each one arrives, up to limit places.
     
-    for place_id in place_ids:
-        try:
-            url = f"https://places.googleapis.com/v1/places/{place_id}"
-            response = requests.get(url, headers=headers)
+    Text Search follows nextPageToken. Nearby Search returns the full circle
+    first (usually cached), then tops up from the 7 sub-circles concurrently,
+    de-duplicated and restricted to the original circle.
+    """
+    if method == "places:searchText":
+        token = None
+        fetched = 0
+        while fetched < limit:
+            page_body = {k: v for k, v in body.items() if k != "maxResultCount"}
+            page_body["pageSize"] = min(20, limit - fetched)
+            if token:
+                page_body["pageToken"] = token
+
+            response = await places_search(method, page_body, PLACES_SEARCH_FIELD_MASK + ",nextPageToken")
             response.raise_for_status()
-            
-            place_data = response.json()
+            data = response.json()
+            places = data.get("places", [])
+            place_index.upsert(places)
+
+            fetched += len(places)
+            yield places
+
+            token = data.get("nextPageToken")
+            if not token or not places:
+                break
+        return
+
+    circle = body["locationRestriction"]["circle"]
+    lat = circle["center"]["latitude"]
+    lng = circle["center"]["longitude"]
+    radius = circle["radius"]
+
+    seen = set()
+    first_page, capped = await geo_cached_places_lookup(method, body)
+    first_page = first_page[:limit]
+    seen.update(p.get("id") for p in first_page)
+    yield first_page
+
+    # An upstream response under the cap means the circle is exhausted; judge
+    # that from the raw count, since re-filtering can shrink a capped page
+    if len(first_page) >= limit or not capped:
+        return
+
+    async def search_tile(tile_lat: float, tile_lng: float, tile_radius: float) -> List[Dict[str, Any]]:
+        tile_body = json.loads(json.dumps(body))
+        tile_body["locationRestriction"]["circle"] = {
+            "center": {"latitude": tile_lat, "longitude": tile_lng},
+            "radius": tile_radius
+        }
+        return await geo_cached_places_search(method, tile_body)
+
+    tasks = [asyncio.ensure_future(search_tile(*tile)) for tile in tile_search_circle(lat, lng, radius)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            page = []
+            for place in await next_done:
+                if place.get("id") in seen or not place_within_radius(place, lat, lng, radius):
+                    continue
+                seen.add(place.get("id"))
+                page.append(place)
+            page = page[:limit - (len(seen) - len(page))]
+            if page:
+                yield page
+            if len(seen) >= limit:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@app.get("/restaurants/search/paged")
+async def search_restaurants_paged(
+    lat: float = Query(..., description="Latitude"),
+    lng: float = Query(..., description="Longitude"),
+    radius: int = Query(5000, description="Search radius in meters", ge=2000, le=25000),
+    cuisine: Optional[str] = Query(None, description="Cuisine type filter"),
+    dietary: Optional[str] = Query(None, description="Dietary preference filter"),
+    price_level: Optional[int] = Query(None, description="Price level (1-4)", ge=1, le=4),
+    venue_type: Optional[str] = Query(None, description="Venue type: coffee, matcha, or cafe"),
+    limit: int = Query(60, description="Maximum places to return", ge=1, le=NEARBY_TILED_MAX_RESULTS),
+    format: str = Query("ndjson", description="Stream format: ndjson or sse", pattern="^(ndjson|sse)$")
+):
+    """
+    Paginated restaurant search streamed as NDJSON (or SSE).
+    Emits one {"type": "page"} line per upstream page as soon as it arrives,
+    then a final {"type": "done"} line (or {"type": "error"} on failure).
+    """
+    keyword = " ".join(k for k in [cuisine, dietary] if k).strip()
+    method, body = build_restaurant_search(lat, lng, radius, keyword, price_level, venue_type)
+    if method == "places:searchText":
+        limit = min(limit, TEXT_SEARCH_MAX_RESULTS)
+    target_price = PRICE_LEVEL_MAP.get(price_level) if price_level else None
+
+    logger.info(f"📄 Paginated search at ({lat}, {lng}) radius {radius}m, limit {limit}")
+
+    async def stream():
+        start_time = time.time()
+        pages = 0
+        total = 0
+        try:
+            async for places in iter_search_pages(method, body, limit):
+                pages += 1
+                if venue_type and venue_type.lower() == "matcha":
+                    places = filter_matcha_venues(places)
+                if target_price:
+                    places = [p for p in places if p.get("priceLevel") == target_price]
+                for place in places:
+                    place_name = place.get("displayName", {}).get("text", "") or place.get("name", "")
+                    place["isChain"] = is_chain_venue(place_name)
+                places = process_place_photos(places)
+                total += len(places)
+
+                yield format_stream_record({
+                    "type": "page",
+                    "page": pages,
+                    "places": places,
+                    "elapsed_ms": round((time.time() - start_time) * 1000)
+                }, format)
+
+            logger.info(f"✅ Paginated search streamed {total} places in {pages} pages")
+            yield format_stream_record({
+                "type": "done",
+                "pages": pages,
+                "total": total,
+                "elapsed_ms": round((time.time() - start_time) * 1000)
+            }, format)
+        except Exception as e:
+            logger.error(f"❌ Error in paginated search: {str(e)}")
+            yield format_stream_record({"type": "error", "detail": str(e)}, format)
+
+    return StreamingResponse(stream(), media_type=STREAM_MEDIA_TYPES[format])
+
+
+# Field mask for service attributes
+PLACE_DETAILS_BATCH_FIELD_MASK = (
+    "id,displayName,formattedAddress,location,types,rating,userRatingCount,priceLevel,photos,"
+    "outdoorSeating,allowsDogs,accessibilityOptions,delivery,dineIn,reservable,servesBeer,"
+    "servesWine,servesVegetarianFood"
+)
+
+# Concurrency limit and per-item timeout (seconds) for batch detail lookups
+DETAILS_BATCH_CONCURRENCY = int(os.getenv("DETAILS_BATCH_CONCURRENCY", "10"))
+DETAILS_ITEM_TIMEOUT = float(os.getenv("DETAILS_ITEM_TIMEOUT_SECONDS", "8"))
+
+# Helper function to fetch place details in batch
+async def fetch_place_details_batch(
+    place_ids: List[str],
+    concurrency: Optional[int] = None,
+    item_timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch place details for multiple place IDs concurrently.
+    
+    Args:
+        place_ids: Place IDs to look up
+        concurrency: Max in-flight requests (defaults to DETAILS_BATCH_CONCURRENCY)
+        item_timeout: Per-place timeout in seconds (defaults to DETAILS_ITEM_TIMEOUT)
+        
+    Returns:
+        One entry per input ID, in input order. Failed lookups are returned as
+        {"place_id": ..., "error": ...} instead of being dropped.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or DETAILS_BATCH_CONCURRENCY))
+    return await asyncio.gather(
+        *(fetch_place_details_item(place_id, semaphore, item_timeout) for place_id in place_ids)
+    )
+
+async def fetch_place_details_item(
+    place_id: str,
+    semaphore: asyncio.Semaphore,
+    item_timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """Fetch one place's service-attribute details; errors are returned, not raised"""
+    item_timeout = item_timeout or DETAILS_ITEM_TIMEOUT
+    async with semaphore:
+        try:
+            place_data = await asyncio.wait_for(
+                get_place_details(place_id, PLACE_DETAILS_BATCH_FIELD_MASK, prefetch=False),
+                timeout=item_timeout
+            )
             # Map id → place_id for consistency
             if 'id' in place_data:
                 place_data['place_id'] = place_data['id']
-            
-            detailed_places.append(place_data)
+            return place_data
+        except asyncio.TimeoutError:
+            logger.error(f"⏱️ Timed out fetching details for {place_id} after {item_timeout}s")
+            return {"place_id": place_id, "error": f"Timed out after {item_timeout}s"}
         except Exception as e:
             logger.error(f"Error fetching details for {place_id}: {str(e)}")
-            continue
-    
-    return detailed_places
+            return {"place_id": place_id, "error": str(e)}
 
 
 # Batch endpoint for fetching place details
@@ -643,14 +3142,120 @@ async def get_place_details_batch(request: PlaceDetailsRequest):
     """
     try:
         logger.info(f"📋 Fetching details for {len(request.place_ids)} places")
-        detailed_places = await fetch_place_details_batch(request.place_ids)
-        logger.info(f"✅ Successfully fetched {len(detailed_places)} place details")
-        return {"places": detailed_places}
+        results = await fetch_place_details_batch(request.place_ids)
+        detailed_places = [place for place in results if "error" not in place]
+        errors = [place for place in results if "error" in place]
+        logger.info(f"✅ Successfully fetched {len(detailed_places)} place details ({len(errors)} failed)")
+        return {"places": detailed_places, "errors": errors}
     except Exception as e:
         logger.error(f"❌ Error fetching place details batch: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Streaming variant of /restaurants/search for service-attribute filters
+@app.get("/restaurants/search/stream")
+async def search_restaurants_stream(
+    lat: float = Query(..., description="Latitude"),
+    lng: float = Query(..., description="Longitude"),
+    radius: int = Query(5000, description="Search radius in meters", ge=2000, le=25000),
+    cuisine: Optional[str] = Query(None, description="Cuisine type filter"),
+    dietary: Optional[str] = Query(None, description="Dietary preference filter"),
+    price_level: Optional[int] = Query(None, description="Price level (1-4)", ge=1, le=4),
+    outdoor_seating: Optional[bool] = Query(None, description="Outdoor seating availability"),
+    pet_friendly: Optional[bool] = Query(None, description="Pet friendly"),
+    wheelchair_accessible: Optional[bool] = Query(None, description="Wheelchair accessible"),
+    delivery_available: Optional[bool] = Query(None, description="Delivery available"),
+    venue_type: Optional[str] = Query(None, description="Venue type: coffee, matcha, or cafe"),
+    format: str = Query("ndjson", description="Stream format: ndjson or sse", pattern="^(ndjson|sse)$")
+):
+    """
+    Same search and filters as /restaurants/search, streamed.
+    Emits a {"type": "place"} record for each place as soon as its details come
+    back and pass the service filters, then a {"type": "summary"} record with
+    counts, chains detected and timings.
+    """
+    service_filters = {
+        "outdoor_seating": outdoor_seating,
+        "pet_friendly": pet_friendly,
+        "wheelchair_accessible": wheelchair_accessible,
+        "delivery_available": delivery_available
+    }
+    needs_details_filtering = any(v is not None for v in service_filters.values())
+    keyword = " ".join(k for k in [cuisine, dietary] if k).strip()
+
+    logger.info(f"📡 Streaming search at ({lat}, {lng}) with radius {radius}m")
+
+    def annotate(place: Dict[str, Any]) -> Dict[str, Any]:
+        place_name = place.get("displayName", {}).get("text", "") or place.get("name", "")
+        place["isChain"] = is_chain_venue(place_name)
+        return process_place_photos([place])[0]
+
+    async def stream():
+        start_time = time.time()
+        candidates = matched = failed = chains = 0
+        search_ms = details_ms = None
+        try:
+            method, body = build_restaurant_search(lat, lng, radius, keyword, price_level, venue_type)
+            places = await geo_cached_places_search(method, body)
+            if venue_type and venue_type.lower() == "matcha":
+                places = filter_matcha_venues(places)
+            candidates = len(places)
+            search_ms = round((time.time() - start_time) * 1000)
+
+            if needs_details_filtering:
+                semaphore = asyncio.Semaphore(max(1, DETAILS_BATCH_CONCURRENCY))
+                place_ids = [place.get("id") for place in places if place.get("id")]
+                tasks = [
+                    asyncio.ensure_future(fetch_place_details_item(place_id, semaphore))
+                    for place_id in place_ids
+                ]
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        place = await next_done
+                        if "error" in place:
+                            failed += 1
+                            continue
+                        if not matches_service_filters(place, service_filters):
+                            continue
+                        place = annotate(place)
+                        matched += 1
+                        chains += 1 if place["isChain"] else 0
+                        yield format_stream_record({"type": "place", "place": place}, format)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                details_ms = round((time.time() - start_time) * 1000) - search_ms
+            else:
+                # Same price post-filter as /restaurants/search
+                if price_level:
+                    target_price = PRICE_LEVEL_MAP.get(price_level)
+                    places = [p for p in places if p.get("priceLevel") == target_price]
+                for place in places:
+                    place = annotate(place)
+                    matched += 1
+                    chains += 1 if place["isChain"] else 0
+                    yield format_stream_record({"type": "place", "place": place}, format)
+
+            logger.info(f"✅ Streamed {matched} of {candidates} places ({failed} detail lookups failed)")
+            yield format_stream_record({
+                "type": "summary",
+                "candidates": candidates,
+                "matched": matched,
+                "failed": failed,
+                "chains_detected": chains,
+                "timings": {
+                    "search_ms": search_ms,
+                    "details_ms": details_ms,
+                    "total_ms": round((time.time() - start_time) * 1000)
+                }
+            }, format)
+        except Exception as e:
+            logger.error(f"❌ Error in streaming search: {str(e)}")
+            yield format_stream_record({"type": "error", "detail": str(e)}, format)
+
+    return StreamingResponse(stream(), media_type=STREAM_MEDIA_TYPES[format])
+
+
 # Keep the old endpoint for backward compatibility
 @app.get("/restaurants")
 async def get_restaurants(
@@ -679,19 +3284,9 @@ async def get_restaurants(
                 }
             }
             
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": GOOGLE_API_KEY,
-                "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.location,places.types,places.rating,places.userRatingCount,places.priceLevel,places.photos"
-            }
-            
             logger.info(f"📤 Calling Text Search API with query: '{keyword} restaurant'")
             
-            response = requests.post(
-                "https://places.googleapis.com/v1/places:searchText",
-                json=body,
-                headers=headers
-            )
+            places = await geo_cached_places_search("places:searchText", body)
         else:
             logger.info(f"📍 No keyword filter - using nearby search")
             # Use Nearby Search when no keyword (original behavior)
@@ -709,22 +3304,7 @@ async def get_restaurants(
                 "maxResultCount": 20
             }
             
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": GOOGLE_API_KEY,
-                "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.location,places.types,places.rating,places.userRatingCount,places.priceLevel,places.photos"
-            }
-            
-            response = requests.post(
-                "https://places.googleapis.com/v1/places:searchNearby",
-                json=body,
-                headers=headers
-            )
-        
-        response.raise_for_status()
-        data = response.json()
-        
-        places = data.get("places", [])
+            places = await geo_cached_places_search("places:searchNearby", body)
         
         if keyword:
             logger.info(f"✅ Found {len(places)} restaurants matching '{keyword}'")
@@ -744,8 +3324,72 @@ async def get_restaurants(
         return places
         
     except Exception as e:
-        logger.error(f"❌ Error fetching restaurants: {str(e)}")
-        logger.error(f"Response content: {response.text if 'response' in locals() else 'No response'}")
+        logger.error(f"❌ Error fetching restaurants: {str(e)}")
+        logger.error(f"Response content: {e.response.text if isinstance(e, httpx.HTTPStatusError) else 'No response'}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Map viewport endpoint - answered from the spatial index when the area is known
+@app.get("/restaurants/viewport")
+async def get_restaurants_in_viewport(
+    north: float = Query(..., description="North edge latitude", ge=-90, le=90),
+    south: float = Query(..., description="South edge latitude", ge=-90, le=90),
+    east: float = Query(..., description="East edge longitude", ge=-180, le=180),
+    west: float = Query(..., description="West edge longitude", ge=-180, le=180),
+    venue_type: Optional[str] = Query(None, description="Venue type: coffee or cafe"),
+    price_level: Optional[int] = Query(None, description="Price level (1-4)", ge=1, le=4)
+):
+    """
+    Get places inside a map bounding box.
+    Served from the in-memory spatial index when the box is freshly covered,
+    otherwise runs a Nearby Search on the circle enclosing the box.
+    """
+    if south > north or west > east:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+
+    try:
+        if venue_type and venue_type.lower() == "coffee":
+            included_types = ["coffee_shop"]
+        elif venue_type and venue_type.lower() == "cafe":
+            included_types = ["cafe"]
+        else:
+            included_types = ["restaurant"]
+
+        target_price = PRICE_LEVEL_MAP.get(price_level) if price_level else None
+
+        places = place_index.query_bbox(south, west, north, east, included_types, target_price)
+
+        if places is None:
+            center_lat, center_lng = (south + north) / 2, (west + east) / 2
+            radius = min(max(haversine_m(center_lat, center_lng, north, east), 1.0), PLACES_MAX_RADIUS_M)
+            logger.info(f"🗺️ Viewport not indexed - Nearby Search at ({center_lat}, {center_lng}) radius {radius:.0f}m")
+            body = {
+                "locationRestriction": {
+                    "circle": {
+                        "center": {
+                            "latitude": center_lat,
+                            "longitude": center_lng
+                        },
+                        "radius": radius
+                    }
+                },
+                "includedTypes": included_types,
+                "maxResultCount": 20
+            }
+            places = await geo_cached_places_search("places:searchNearby", body)
+            places = [p for p in places if place_in_bbox(p, south, west, north, east)]
+            if target_price:
+                places = [p for p in places if p.get("priceLevel") == target_price]
+
+        for place in places:
+            place_name = place.get("displayName", {}).get("text", "") or place.get("name", "")
+            place["isChain"] = is_chain_venue(place_name)
+
+        logger.info(f"✅ Found {len(places)} places in viewport")
+        return process_place_photos(places)
+
+    except Exception as e:
+        logger.error(f"❌ Error fetching viewport places: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Update the restaurant details endpoint as well
@@ -758,20 +3402,11 @@ async def get_restaurant_details(place_id: str):
             "message": "Details not available for fallback IDs"
         }
     
-    url = f"https://places.googleapis.com/v1/places/{place_id}"
-    
-    headers = {
-        "Content-Type": "application/json",
-        "X-Goog-Api-Key": GOOGLE_API_KEY,
-        "X-Goog-FieldMask": "id,displayName,formattedAddress,location,types,rating,priceLevel,photos,reviews"
-    }
-    
     try:
         print(f"Fetching details for place_id: {place_id}")
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = await get_place_details(
+            place_id, "id,displayName,formattedAddress,location,types,rating,priceLevel,photos,reviews"
+        )
         
         # Map id → place_id for frontend consistency
         if 'id' in data:
@@ -793,7 +3428,10 @@ async def get_restaurant_details(place_id: str):
             data["photos"] = processed_photos
             
         return data
-    except requests.exceptions.RequestException as e:
+    except (CircuitOpenError, asyncio.TimeoutError) as e:
+        logger.warning(f"⚠️ Places unavailable for {place_id}: {str(e) or 'timeout'}")
+        raise HTTPException(status_code=503, detail=f"Places API temporarily unavailable: {str(e) or 'timeout'}")
+    except httpx.HTTPError as e:
         print(f"Error fetching place details: {str(e)}")
         raise HTTPException(status_code=404, detail=f"Restaurant details not found: {str(e)}")
 
@@ -808,35 +3446,23 @@ async def get_restaurant_reviews(place_id: str):
             "reviews": []
         }
     
-    url = f"https://places.googleapis.com/v1/places/{place_id}"
-    
-    headers = {
-        # Add this missing Content-Type header
-        "Content-Type": "application/json",
-        "X-Goog-Api-Key": GOOGLE_API_KEY,
-        "X-Goog-FieldMask": "reviews,displayName"
-    }
-    
     try:
         print(f"Fetching reviews for place_id: {place_id}")
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = await get_place_details(place_id, "reviews,displayName")
         
         return {
             "place_id": place_id,
             "displayName": data.get("displayName", {"text": "Restaurant"}),
             "reviews": data.get("reviews", [])
         }
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, CircuitOpenError, asyncio.TimeoutError) as e:
         print(f"Error fetching reviews: {str(e)}")
-        # Return empty reviews instead of raising an error
-        return {
+        # Keep the empty-reviews body, but as a 503 so clients and caches don't keep it
+        return JSONResponse(status_code=503, content={
             "place_id": place_id,
             "reviews": [],
             "error": str(e)
-        }
+        })
 
 
 @app.get("/restaurants/{place_id}/tiktok-links")
@@ -852,16 +3478,8 @@ async def get_restaurant_tiktok_links(place_id: str, limit: int = 6):
         }
 
     # Fetch restaurant name
-    details_url = f"https://places.googleapis.com/v1/places/{place_id}"
-    headers = {
-        "Content-Type": "application/json",
-        "X-Goog-Api-Key": GOOGLE_API_KEY,
-        "X-Goog-FieldMask": "id,displayName,formattedAddress",
-    }
     try:
-        resp = requests.get(details_url, headers=headers)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await get_place_details(place_id, "id,displayName,formattedAddress")
         name = data.get("displayName", {}).get("text") or ""
     except Exception as e:
         print(f"Error getting restaurant details: {e}")
@@ -908,16 +3526,7 @@ async def get_restaurant_tiktok_google(place_id: str, limit: int = 5):
     
     try:
         # First, get the restaurant details to get the name
-        restaurant_details_url = f"https://places.googleapis.com/v1/places/{place_id}"
-        headers = {
-            "Content-Type": "application/json",
-            "X-Goog-Api-Key": GOOGLE_API_KEY,
-            "X-Goog-FieldMask": "id,displayName,formattedAddress"
-        }
-        
-        response = requests.get(restaurant_details_url, headers=headers)
-        response.raise_for_status()
-        restaurant_data = response.json()
+        restaurant_data = await get_place_details(place_id, "id,displayName,formattedAddress")
         
         restaurant_name = restaurant_data.get("displayName", {}).get("text", "")
         if not restaurant_name:
@@ -936,7 +3545,7 @@ async def get_restaurant_tiktok_google(place_id: str, limit: int = 5):
         }
         
         # Make request to Google
-        google_response = requests.get(google_search_url, headers=browser_headers)
+        google_response = await upstream.get(google_search_url, headers=browser_headers, policy="google_html")
         google_response.raise_for_status()
         
         # Parse the HTML
@@ -1000,6 +3609,281 @@ async def get_restaurant_tiktok_google(place_id: str, limit: int = 5):
         }
 
 # ==================== PLAYWRIGHT SCRAPER FUNCTION ====================
+# ==================== PRE-WARMED SCRAPE PAGES ====================
+SCRAPE_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "locale": "en-US",
+    "timezone_id": "America/New_York",
+    "ignore_https_errors": True,
+    "java_script_enabled": True,
+    "extra_http_headers": {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+        "DNT": "1",
+        "Upgrade-Insecure-Requests": "1"
+    }
+}
+
+# Block images and media to save bandwidth/memory
+SCRAPE_BLOCKED_RESOURCES = "**/*.{png,jpg,jpeg,gif,webp,svg,mp4,avi,mov,mp3,wav,woff,woff2,ttf,eot}"
+
+# Stealth script to avoid detection
+SCRAPE_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', { get: () => false });
+"""
+
+def page_origin(url: str) -> Optional[str]:
+    """scheme://host[:port] of an http(s) URL, or None for about:blank and the like"""
+    parsed = urllib.parse.urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+class WarmPage:
+    """A configured context and page, plus the browser it's checked out with"""
+    __slots__ = ("context", "page", "uses", "browser", "origins")
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.browser = None
+        # Origins any frame of the page has loaded since the last reset
+        self.origins = set()
+        page.on("framenavigated", self._record_origin)
+
+    def _record_origin(self, frame):
+        origin = page_origin(frame.url)
+        if origin:
+            self.origins.add(origin)
+
+class ScrapePagePool:
+    """
+    Keeps one fully configured context/page ready on every pooled browser.
+    
+    Pages are prepared when a browser launches (BrowserPool warmup hook) and
+    reset between scrapes, so a scrape starts from a hot page: all storage
+    (local/session storage, IndexedDB, cache storage, service workers) is
+    cleared over CDP for every origin the page visited, along with cookies,
+    and the page goes back to about:blank. A page is rebuilt after max_uses
+    scrapes or if its reset fails.
+    """
+    def __init__(self, max_uses: int = 50):
+        self.max_uses = max_uses
+        self.counters = {"hot": 0, "cold": 0, "resets": 0, "rebuilds": 0}
+
+    async def warm(self, browser) -> WarmPage:
+        """Create a context and page with the scrape configuration installed"""
+        proxy_config = None
+        proxy_url = os.getenv("TIKTOK_PROXY_URL")
+        if proxy_url:
+            logger.info(f"🛡️ Using proxy for TikTok scraping")
+            proxy_config = {"server": proxy_url}
+        
+        context = await browser.new_context(**SCRAPE_CONTEXT_OPTIONS, proxy=proxy_config)
+        try:
+            await context.route(SCRAPE_BLOCKED_RESOURCES, lambda route: route.abort())
+            # Context-level, so it also applies after the page navigates
+            await context.add_init_script(SCRAPE_INIT_SCRIPT)
+            page = await context.new_page()
+        except Exception:
+            await context.close()
+            raise
+        return WarmPage(context, page)
+
+    async def checkout(self) -> WarmPage:
+        """Acquire a browser and take its warm page (building one if needed)"""
+        browser = await browser_pool.acquire()
+        slot = browser_pool.slots.get(id(browser))
+        warm = slot.warm if slot else None
+        if slot:
+            slot.warm = None
+        
+        try:
+            if warm is None or warm.page.is_closed():
+                self.counters["cold"] += 1
+                warm = await self.warm(browser)
+            else:
+                self.counters["hot"] += 1
+        except Exception:
+            await browser_pool.release(browser)
+            raise
+        
+        warm.uses += 1
+        warm.browser = browser
+        return warm
+
+    async def _reset(self, warm: WarmPage):
+        for extra_page in warm.context.pages:
+            if extra_page is not warm.page:
+                await extra_page.close()
+        if warm.origins:
+            cdp = await warm.context.new_cdp_session(warm.page)
+            try:
+                for origin in warm.origins:
+                    await cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            finally:
+                await cdp.detach()
+        await warm.context.clear_cookies()
+        await warm.page.goto("about:blank")
+        warm.origins.clear()
+
+    async def checkin(self, warm: WarmPage):
+        """Reset the page, park it on its browser's slot and release the browser"""
+        browser, warm.browser = warm.browser, None
+        try:
+            slot = browser_pool.slots.get(id(browser))
+            if slot is None or not browser.is_connected():
+                return
+            try:
+                if warm.uses >= self.max_uses:
+                    raise RuntimeError(f"page used {warm.uses} times")
+                await self._reset(warm)
+                self.counters["resets"] += 1
+            except Exception as e:
+                logger.info(f"♻️ Rebuilding scrape page: {str(e)}")
+                self.counters["rebuilds"] += 1
+                try:
+                    await warm.context.close()
+                except Exception:
+                    pass
+                try:
+                    warm = await self.warm(browser)
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not rebuild scrape page: {str(e)}")
+                    return
+            slot.warm = warm
+        finally:
+            await browser_pool.release(browser)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+# Global scrape page pool instance
+scrape_pages = ScrapePagePool(max_uses=int(os.getenv("SCRAPE_PAGE_MAX_USES", "50")))
+
+# ==================== TIKTOK SEARCH API INTERCEPTION ====================
+# Origin the scraper navigates to; point at a stand-in server to test offline
+TIKTOK_BASE_URL = os.getenv("TIKTOK_BASE_URL", "https://www.tiktok.com").rstrip("/")
+# "network" reads the search page's own API responses and falls back to the
+# DOM; "dom" only reads the rendered DOM
+TIKTOK_EXTRACTION_MODE = os.getenv("TIKTOK_EXTRACTION_MODE", "network").lower()
+# How long to wait for search API responses before falling back to the DOM
+TIKTOK_API_WAIT_MS = int(os.getenv("TIKTOK_API_WAIT_MS", "4000"))
+TIKTOK_SEARCH_API_PATH = "/api/search/"
+
+TIKTOK_VIDEO_SELECTORS = [
+    "div[data-e2e='search_video-item']",
+    "div[data-e2e='search-card-item']",
+    "div[class*='DivItemContainer']",
+    "a[href*='/video/']"
+]
+
+def extract_tiktok_search_items(payload: Any) -> List[Dict]:
+    """
+    Pull video items out of a TikTok search API response.
+    
+    Handles both the general search shape ({"data": [{"type": 1, "item": ...}]})
+    and the video search shape ({"item_list": [...]}).
+    
+    Args:
+        payload: Decoded JSON body
+    
+    Returns:
+        Raw item dictionaries (may be empty)
+    """
+    if not isinstance(payload, dict):
+        return []
+    
+    items = []
+    for entry in payload.get("data") or []:
+        if isinstance(entry, dict) and isinstance(entry.get("item"), dict):
+            items.append(entry["item"])
+    for item in payload.get("item_list") or []:
+        if isinstance(item, dict):
+            items.append(item)
+    return items
+
+def tiktok_item_to_video(item: Dict, index: int) -> Optional[Dict]:
+    """
+    Convert a search API item to the scraper's video dictionary.
+    
+    Args:
+        item: Raw item from extract_tiktok_search_items
+        index: Position in the result list (1-based)
+    
+    Returns:
+        Video dictionary with id, thumbnail, url, description, or None if the
+        item has no usable id/author
+    """
+    video_id = item.get("id")
+    author = item.get("author") or {}
+    unique_id = author.get("uniqueId") if isinstance(author, dict) else None
+    if not video_id or not unique_id:
+        return None
+    
+    video = item.get("video") or {}
+    thumbnail = video.get("cover") or video.get("originCover") or video.get("dynamicCover") or ""
+    description = (item.get("desc") or "").strip()
+    
+    return {
+        "id": f"video-{index}",
+        "thumbnail": thumbnail,
+        "url": f"{TIKTOK_BASE_URL}/@{unique_id}/video/{video_id}",
+        "description": description[:100] or "TikTok Video"
+    }
+
+class TikTokSearchInterceptor:
+    """
+    Collects videos from search API responses as the page receives them.
+    
+    Attach to a page before navigating; wait() returns as soon as limit
+    videos have arrived, or whatever arrived once the wait times out.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.videos: List[Dict] = []
+        self._seen_urls: set = set()
+        self._enough = asyncio.Event()
+
+    async def on_response(self, response):
+        if TIKTOK_SEARCH_API_PATH not in response.url or self._enough.is_set():
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        
+        for item in extract_tiktok_search_items(payload):
+            video = tiktok_item_to_video(item, len(self.videos) + 1)
+            if video is None or video["url"] in self._seen_urls:
+                continue
+            self._seen_urls.add(video["url"])
+            self.videos.append(video)
+            if len(self.videos) >= self.limit:
+                self._enough.set()
+                break
+
+    def attach(self, page):
+        page.on("response", self.on_response)
+
+    def detach(self, page):
+        try:
+            page.remove_listener("response", self.on_response)
+        except Exception:
+            pass
+
+    async def wait(self, timeout_ms: int) -> List[Dict]:
+        try:
+            await asyncio.wait_for(self._enough.wait(), timeout=timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            pass
+        return self.videos[:self.limit]
+
+class TikTokScrapeError(Exception):
+    """Raised when a scrape fails for infrastructure reasons (navigation, browser, page errors)"""
+
 async def scrape_tiktok_videos_playwright(
     restaurant_name: str,
     limit: int = 4,
@@ -1014,88 +3898,56 @@ async def scrape_tiktok_videos_playwright(
         timeout: Timeout in milliseconds
     
     Returns:
-        List of video dictionaries with id, thumbnail, url, description
+        List of video dictionaries with id, thumbnail, url, description; empty
+        when TikTok has no videos for the search
+    
+    Raises:
+        TikTokScrapeError if navigation or the browser fails, so the tiktok
+        upstream policy counts it as a failure
+        BrowserAcquireTimeout if no browser frees up in time
     """
     
-    browser = None
-    context = None
+    lease = None
+    interceptor = None
     try:
-        # Acquire browser from pool
-        browser = await browser_pool.acquire()
-        
-        # Configure proxy if available
-        proxy_config = None
-        proxy_url = os.getenv("TIKTOK_PROXY_URL")
-        if proxy_url:
-            logger.info(f"🛡️ Using proxy for TikTok scraping")
-            proxy_config = {"server": proxy_url}
-        
-        # Create new page/context (isolated) with stealth settings
-        # Block images and media to save bandwidth/memory
-        context = await browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            locale="en-US",
-            timezone_id="America/New_York",
-            ignore_https_errors=True,
-            java_script_enabled=True,
-            proxy=proxy_config,
-            extra_http_headers={
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.9",
-                "DNT": "1",
-                "Upgrade-Insecure-Requests": "1"
-            }
-        )
-        
-        # Block resource heavy requests
-        await context.route("**/*.{png,jpg,jpeg,gif,webp,svg,mp4,avi,mov,mp3,wav,woff,woff2,ttf,eot}", lambda route: route.abort())
-        
-        page = await context.new_page()
-        
-        # Add stealth scripts to avoid detection
-        await page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => false });
-        """)
+        # Check out a browser with its pre-configured page (proxy, stealth
+        # settings, resource blocking and init scripts already installed)
+        lease = await scrape_pages.checkout()
+        page = lease.page
         
         # Construct search URL
         search_query = f"{restaurant_name} restaurant"
-        tiktok_search_url = f"https://www.tiktok.com/search?q={search_query.replace(' ', '+')}"
+        tiktok_search_url = f"{TIKTOK_BASE_URL}/search?q={search_query.replace(' ', '+')}"
         
         logger.info(f"🔍 Scraping TikTok for: {search_query}")
         
-        # Navigate to TikTok search with retry logic
+        # Listen for the page's own search API responses before navigating,
+        # since they can land before domcontentloaded
+        if TIKTOK_EXTRACTION_MODE == "network":
+            interceptor = TikTokSearchInterceptor(limit)
+            interceptor.attach(page)
+        
         try:
             await page.goto(
                 tiktok_search_url,
                 wait_until="domcontentloaded",
                 timeout=timeout
             )
-            # Wait a bit for dynamic content
-            await page.wait_for_timeout(2000)
         except Exception as e:
             logger.warning(f"⏱️ Navigation failed for {search_query}: {str(e)}")
-            return []
-        
-        # Try multiple selector strategies
-        video_elements_found = False
-        selectors_to_try = [
-            "div[data-e2e='search_video-item']",
-            "div[data-e2e='search-card-item']", 
-            "div[class*='DivItemContainer']",
-            "a[href*='/video/']"
-        ]
+            raise TikTokScrapeError(f"navigation failed: {str(e)}") from e
         
-        for selector in selectors_to_try:
-            try:
-                await page.wait_for_selector(selector, timeout=2000)
-                logger.info(f"✅ Found videos with selector: {selector}")
-                video_elements_found = True
-                break
-            except:
-                continue
+        if interceptor:
+            videos = await interceptor.wait(TIKTOK_API_WAIT_MS)
+            if videos:
+                logger.info(f"✅ Intercepted {len(videos)} videos from search API for {restaurant_name}")
+                return videos
+            logger.info(f"🔁 No search API results for {restaurant_name}, falling back to DOM")
         
-        if not video_elements_found:
+        # DOM fallback: wait for any of the selector strategies at once
+        try:
+            await page.wait_for_selector(", ".join(TIKTOK_VIDEO_SELECTORS), timeout=2000)
+        except Exception:
             logger.warning(f"❌ No video elements found for {restaurant_name}")
             return []
         
@@ -1156,21 +4008,19 @@ async def scrape_tiktok_videos_playwright(
         logger.info(f"✅ Successfully scraped {len(videos)} videos for {restaurant_name}")
         return videos
     
+    except (TikTokScrapeError, BrowserAcquireTimeout):
+        raise
     except Exception as e:
         logger.error(f"❌ Error scraping TikTok: {str(e)}")
-        return []
+        raise TikTokScrapeError(str(e)) from e
     
     finally:
-        # CRITICAL: Always close context to free memory
-        if context:
-            try:
-                await context.close()
-            except:
-                pass
-                
-        # Always return browser to pool
-        if browser:
-            await browser_pool.release(browser)
+        # Stop listening before the page goes back to the pool
+        if interceptor and lease:
+            interceptor.detach(lease.page)
+        # Always reset the page and return the browser to the pool
+        if lease:
+            await scrape_pages.checkin(lease)
 
 # Helper function to generate placeholder videos
 def generate_placeholder_videos(restaurant_name: str, limit: int, search_url: str) -> List[Dict]:
@@ -1192,11 +4042,196 @@ def generate_placeholder_videos(restaurant_name: str, limit: int, search_url: st
     
     return videos
 
+TIKTOK_SCRAPE_LOCK_TTL = float(os.getenv("TIKTOK_SCRAPE_LOCK_TTL_SECONDS", "90"))
+# How long other workers skip a place after a scrape found nothing for it
+TIKTOK_SHARED_MISS_TTL = float(os.getenv("TIKTOK_SHARED_MISS_TTL_SECONDS", "300"))
+# How long other workers skip a place after a scrape for it failed
+TIKTOK_SHARED_FAILURE_TTL = float(os.getenv("TIKTOK_SHARED_FAILURE_TTL_SECONDS", "30"))
+# Videos scraped per restaurant regardless of the requested limit, so any
+# limit up to this is served from one cache entry
+TIKTOK_SCRAPE_BATCH = int(os.getenv("TIKTOK_SCRAPE_BATCH", "12"))
+TIKTOK_MAX_LIMIT = int(os.getenv("TIKTOK_MAX_LIMIT", "30"))
+
+def tiktok_cache_key(place_id: str) -> str:
+    return f"tiktok:{place_id}"
+
+def tiktok_miss_key(place_id: str) -> str:
+    # Separate from tiktok:{place_id} so a miss never overwrites a stale batch on disk
+    return f"tiktok-miss:{place_id}"
+
+def tiktok_batch_covers(batch: Dict[str, Any], limit: int) -> bool:
+    """
+    Whether a cached batch can serve limit videos.
+    
+    A batch that came back shorter than it was scraped for means TikTok had
+    no more, so it covers every limit up to what was asked of it.
+    """
+    return len(batch["videos"]) >= limit or batch["scraped_limit"] >= limit
+
+def merge_tiktok_videos(fresh: List[Dict], previous: List[Dict], limit: int) -> List[Dict]:
+    """Fresh videos first, then previously cached ones not seen again, renumbered"""
+    merged, seen = [], set()
+    for video in fresh + previous:
+        identity = video.get("url") or video.get("id")
+        if identity in seen:
+            continue
+        seen.add(identity)
+        merged.append({**video, "id": f"video-{len(merged) + 1}"})
+        if len(merged) >= limit:
+            break
+    return merged
+
+async def scrape_tiktok_once_per_node(
+    place_id: str,
+    restaurant_name: str,
+    scrape_limit: int,
+    newer_than: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Scrape TikTok unless another worker is already doing it.
+    
+    single_flight coalesces within this process; the shared cache lock
+    extends that across workers, and waiters pick up the holder's batch.
+    Only a shared batch that covers scrape_limit and was scraped after
+    newer_than counts, so a refresh or top-up never settles for the batch
+    it is replacing (with the SQLite backend that is the same row). When the
+    holder finds nothing, or fails, it publishes a short-lived marker
+    instead, so waiting workers don't each rescrape the place in turn.
+    
+    Args:
+        newer_than: scraped_at of the batch being refreshed (0 for a miss)
+    
+    Returns:
+        Batch dict {"videos", "scraped_limit", "scraped_at"}; the videos are
+        only what this scrape found (merging with the cached batch is up to
+        the caller)
+    """
+    cache_key = tiktok_cache_key(place_id)
+    miss_key = tiktok_miss_key(place_id)
+    
+    def usable(batch: Dict[str, Any]) -> bool:
+        return batch.get("scraped_at", 0) > newer_than and tiktok_batch_covers(batch, scrape_limit)
+    
+    def from_marker(marker: Dict[str, Any]) -> Dict[str, Any]:
+        if marker.get("error"):
+            raise TikTokScrapeError(f"Another worker's scrape failed: {marker['error']}")
+        logger.info(f"🔗 Another worker found no TikTok videos for {restaurant_name}")
+        return {"videos": [], "scraped_limit": scrape_limit, "scraped_at": time.time()}
+    
+    marker = await shared_cache.get(miss_key)
+    if marker is not None:
+        return from_marker(marker)
+    
+    batch, locked = await shared_cache.get_or_lock(
+        cache_key,
+        lock_ttl=TIKTOK_SCRAPE_LOCK_TTL,
+        wait_timeout=TIKTOK_SCRAPE_LOCK_TTL,
+        accept=usable,
+        marker_key=miss_key
+    )
+    if batch is not None:
+        if "videos" not in batch:
+            return from_marker(batch)
+        logger.info(f"🔗 TikTok videos for {restaurant_name} scraped by another worker")
+        return batch
+
+    try:
+        # The previous holder may have released the lock after finding nothing
+        marker = await shared_cache.get(miss_key)
+        if marker is not None:
+            return from_marker(marker)
+        
+        try:
+            videos = await upstream_policies["tiktok"].call(
+                lambda: scrape_tiktok_videos_playwright(restaurant_name, scrape_limit, timeout=45000),
+                idempotent=False
+            )
+        except (CircuitOpenError, BrowserAcquireTimeout):
+            # This process's breaker or browser pool; other workers may be fine
+            raise
+        except Exception as e:
+            await shared_cache.set(miss_key, {"reason": "error", "error": str(e)[:200]}, TIKTOK_SHARED_FAILURE_TTL)
+            raise
+        
+        batch = {"videos": videos, "scraped_limit": scrape_limit, "scraped_at": time.time()}
+        if videos:
+            await shared_cache.set(cache_key, batch, TIKTOK_CACHE_TTL)
+        else:
+            await shared_cache.set(miss_key, {"reason": "no videos"}, TIKTOK_SHARED_MISS_TTL)
+        return batch
+    finally:
+        if locked:
+            await shared_cache.unlock(cache_key)
+
+async def scrape_tiktok_into_cache(
+    place_id: str,
+    restaurant_name: str,
+    scrape_limit: int,
+    previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Scrape a batch of TikTok videos for a restaurant and cache it under the place.
+    
+    Concurrent callers for the same place and batch size (requests and
+    background refreshes) share a single scrape. A top-up or refresh is
+    merged with the previous batch's videos so a short scrape never shrinks
+    the batch. Empty results are not cached, so a stale entry keeps being
+    served rather than being replaced by nothing; instead the place is put
+    into exponential backoff (see tiktok_backoff).
+    
+    Args:
+        previous: The cached batch being refreshed or topped up, if any
+    
+    Returns:
+        Batch dict {"videos", "scraped_limit", "scraped_at"}
+    """
+    cache_key = tiktok_cache_key(place_id)
+    previous_videos = previous["videos"] if previous else []
+    newer_than = previous.get("scraped_at", 0.0) if previous else 0.0
+    logger.info(f"🔍 Scraping {scrape_limit} TikTok videos for: {restaurant_name}")
+    
+    # Scrape using Playwright with browser pool
+    # Increased timeout to 45s for proxy latency
+    try:
+        batch = await single_flight.do(
+            "tiktok_scrape",
+            f"{cache_key}:{scrape_limit}",
+            lambda: scrape_tiktok_once_per_node(place_id, restaurant_name, scrape_limit, newer_than)
+        )
+    except (CircuitOpenError, BrowserAcquireTimeout):
+        # TikTok as a whole is unavailable, or every browser is busy; not
+        # this place's fault, so no backoff and nothing cached
+        raise
+    except Exception as e:
+        backoff = tiktok_backoff.record_miss(place_id, f"error: {str(e)[:200]}")
+        logger.warning(f"⏳ TikTok scrape failed for {restaurant_name}, backing off {backoff:.0f}s")
+        raise
+    
+    if not batch["videos"]:
+        backoff = tiktok_backoff.record_miss(place_id, "no videos")
+        logger.warning(f"⏳ No TikTok videos for {restaurant_name}, backing off {backoff:.0f}s")
+        return batch
+    
+    batch = {
+        "videos": merge_tiktok_videos(batch["videos"], previous_videos, batch["scraped_limit"]),
+        "scraped_limit": batch["scraped_limit"],
+        "scraped_at": batch.get("scraped_at", time.time())
+    }
+    tiktok_cache.set(cache_key, batch)
+    tiktok_backoff.record_success(place_id)
+    return batch
+
 @app.get("/restaurants/{place_id}/tiktok-videos")
 async def get_restaurant_tiktok_videos(place_id: str, limit: int = 4):
     """
     Scrape actual TikTok videos for a restaurant using Playwright (async, fast)
+    
+    One batch of up to max(limit, TIKTOK_SCRAPE_BATCH) videos is cached per
+    place and sliced to the requested limit; a limit beyond the cached batch
+    triggers a top-up scrape.
     """
+    limit = max(1, min(limit, TIKTOK_MAX_LIMIT))
+    
     # Skip API call for fallback IDs
     if place_id.startswith("fallback-"):
         return {
@@ -1206,46 +4241,56 @@ async def get_restaurant_tiktok_videos(place_id: str, limit: int = 4):
     
     try:
         # First, get the restaurant details to get the name
-        restaurant_details_url = f"https://places.googleapis.com/v1/places/{place_id}"
-        headers = {
-            "Content-Type": "application/json",
-            "X-Goog-Api-Key": GOOGLE_API_KEY,
-            "X-Goog-FieldMask": "id,displayName,formattedAddress"
-        }
-        
-        response = requests.get(restaurant_details_url, headers=headers)
-        response.raise_for_status()
-        restaurant_data = response.json()
+        restaurant_data = await get_place_details(place_id, "id,displayName,formattedAddress")
         
         restaurant_name = restaurant_data.get("displayName", {}).get("text", "")
         if not restaurant_name:
             return {"place_id": place_id, "videos": [], "error": "Restaurant name not found"}
             
-        # Create cache key
-        cache_key = f"tiktok:{place_id}:{limit}"
-        
-        # Check cache first
-        cached_videos = tiktok_cache.get(cache_key)
-        if cached_videos is not None:
-            logger.info(f"🎯 Cache HIT for {restaurant_name}")
+        # One cache entry per place, whatever limit was asked for
+        cache_key = tiktok_cache_key(place_id)
+        
+        # Check cache first; expired-but-recent entries are served while one
+        # background task rescrapes, so the scrape stays off the request path
+        cached = await tiktok_cache.aget_with_age(cache_key)
+        if cached is not None and tiktok_batch_covers(cached[0], limit):
+            batch, expires_in = cached
+            stale = expires_in <= 0
+            tiktok_refresher.record_hit(cache_key)
+            if tiktok_refresher.should_refresh(cache_key, expires_in):
+                scheduled = tiktok_backoff.retry_in(place_id) is None and tiktok_refresher.schedule(
+                    cache_key,
+                    lambda: scrape_tiktok_into_cache(place_id, restaurant_name, batch["scraped_limit"], batch)
+                )
+                if scheduled:
+                    logger.info(f"🔄 Background TikTok refresh for {restaurant_name} ({'stale' if stale else 'refresh-ahead'})")
+            logger.info(f"🎯 Cache HIT for {restaurant_name}{' (stale)' if stale else ''}")
             return {
                 "place_id": place_id,
                 "restaurant_name": restaurant_name,
-                "videos": cached_videos,
-                "cached": True
+                "videos": batch["videos"][:limit],
+                "cached": True,
+                "stale": stale
             }
         
-        logger.info(f"🔍 Scraping TikTok for: {restaurant_name}")
+        # Miss, or a cached batch too small for this limit (top it up)
+        previous = cached[0] if cached is not None else None
+        previous_videos = previous["videos"] if previous else []
+        scrape_limit = max(limit, TIKTOK_SCRAPE_BATCH)
         
-        logger.info(f"🔍 Scraping TikTok for: {restaurant_name}")
-        
-        # Scrape using Playwright with browser pool
-        # Increased timeout to 45s for proxy latency
-        try:
-            videos = await scrape_tiktok_videos_playwright(restaurant_name, limit, timeout=45000)
-        except Exception as e:
-            logger.error(f"⚠️ Playwright scraping failed: {str(e)}")
-            videos = []
+        # Skip the browser entirely for places that recently yielded nothing
+        retry_in = tiktok_backoff.retry_in(place_id)
+        if retry_in is not None:
+            logger.info(f"⏳ Skipping TikTok scrape for {restaurant_name} (backing off {retry_in:.0f}s)")
+            videos = previous_videos
+        else:
+            try:
+                batch = await scrape_tiktok_into_cache(place_id, restaurant_name, scrape_limit, previous)
+                videos = batch["videos"] or previous_videos
+            except Exception as e:
+                logger.error(f"⚠️ Playwright scraping failed: {str(e)}")
+                videos = previous_videos
+        videos = videos[:limit]
         
         # Create TikTok search URL for fallback
         tiktok_search_url = f"https://www.tiktok.com/search?q={restaurant_name.replace(' ', '+')}+restaurant"
@@ -1254,39 +4299,331 @@ async def get_restaurant_tiktok_videos(place_id: str, limit: int = 4):
         if len(videos) == 0:
             logger.warning(f"⚠️ No videos found for {restaurant_name}, using placeholders")
             videos = generate_placeholder_videos(restaurant_name, limit, tiktok_search_url)
+        
+        response = {
+            "place_id": place_id,
+            "restaurant_name": restaurant_name,
+            "videos": videos,
+            "search_url": tiktok_search_url,
+            "cached": False,
+            "stale": False
+        }
+        if retry_in is not None:
+            response["retry_in_seconds"] = round(retry_in)
+        return response
+                
+    except Exception as e:
+        logger.error(f"❌ Error in TikTok endpoint: {str(e)}")
+        # Fallback to placeholders even on critical error
+        try:
+            # Try to get name from request if possible, otherwise use generic
+            name = "Restaurant"
+            tiktok_search_url = "https://www.tiktok.com/"
+            videos = generate_placeholder_videos(name, limit, tiktok_search_url)
+            return {
+                "place_id": place_id,
+                "restaurant_name": name,
+                "videos": videos,
+                "search_url": tiktok_search_url,
+                "error": str(e)
+            }
+        except:
+            return {
+                "place_id": place_id,
+                "videos": [],
+                "error": str(e)
+            }
+
+# ==================== TIKTOK SCRAPE JOB QUEUE ====================
+class ScrapeQueueFullError(Exception):
+    """Raised when the scrape job queue is at capacity"""
+
+class ScrapeJob:
+    """One queued TikTok scrape: queued -> running -> done | failed"""
+    def __init__(self, place_id: str, limit: int, priority: int):
+        self.id = uuid.uuid4().hex
+        self.place_id = place_id
+        self.limit = limit
+        self.priority = priority
+        self.state = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        # Set on every state change so SSE listeners wake up
+        self.changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed")
+
+    def transition(self, state: str):
+        self.state = state
+        if state == "running":
+            self.started_at = time.time()
+        elif state in ("done", "failed"):
+            self.finished_at = time.time()
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        job = {
+            "job_id": self.id,
+            "place_id": self.place_id,
+            "limit": self.limit,
+            "priority": self.priority,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if self.result is not None:
+            job["result"] = self.result
+        if self.error is not None:
+            job["error"] = self.error
+        return job
+
+class ScrapeJobQueue:
+    """
+    Bounded priority queue of TikTok scrapes drained by a fixed worker set.
+    
+    One worker runs per browser the pool can grow to, but only the first
+    capacity_fn() of them (the pool's current target size) take jobs, so
+    browser work waits here, where it is visible and can be shed, instead
+    of inside BrowserPool.acquire(). Queue depth is what drives the pool's
+    autoscaler to add browsers, which un-parks more workers.
+    Lower priority numbers run first. A queued or running job for the same
+    place that covers the requested limit is reused instead of duplicated.
+    Finished jobs are kept for retention seconds so clients can poll them.
+    Unlike the synchronous endpoint, jobs never fall back to placeholders:
+    a scrape error, a backed-off place or an empty result fails the job.
+    """
+    def __init__(
+        self,
+        max_depth: int = 100,
+        workers: int = 2,
+        job_timeout: float = 90.0,
+        retention: float = 600.0,
+        capacity_fn: Optional[Callable[[], int]] = None,
+        capacity_poll: float = 0.5
+    ):
+        self.max_depth = max_depth
+        self.worker_count = workers
+        self.capacity_fn = capacity_fn
+        self.capacity_poll = capacity_poll
+        self.job_timeout = job_timeout
+        self.retention = retention
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.jobs: "OrderedDict[str, ScrapeJob]" = OrderedDict()
+        self.active_by_place: Dict[str, ScrapeJob] = {}
+        self.workers: List[asyncio.Task] = []
+        self.sequence = 0
+        self.counters = {"submitted": 0, "deduplicated": 0, "shed": 0, "done": 0, "failed": 0}
+
+    def start(self):
+        self.workers = [asyncio.create_task(self._worker(i)) for i in range(self.worker_count)]
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        return self.jobs.get(job_id)
+
+    def submit(self, place_id: str, limit: int, priority: int = 5) -> ScrapeJob:
+        """
+        Queue a scrape, or return the equivalent job already in flight.
+        
+        Raises:
+            ScrapeQueueFullError if max_depth jobs are already waiting
+        """
+        self._prune()
+        # Clamp first, so limits that scrape the same batch share a job
+        limit = max(1, min(limit, TIKTOK_MAX_LIMIT))
+        active = self.active_by_place.get(place_id)
+        if active is not None and active.limit >= limit:
+            self.counters["deduplicated"] += 1
+            return active
+
+        if self.queue.qsize() >= self.max_depth:
+            self.counters["shed"] += 1
+            raise ScrapeQueueFullError(f"TikTok scrape queue is full ({self.max_depth} jobs waiting)")
+
+        job = ScrapeJob(place_id, limit, priority)
+        self.jobs[job.id] = job
+        self.active_by_place[place_id] = job
+        self.sequence += 1
+        self.queue.put_nowait((priority, self.sequence, job.id))
+        self.counters["submitted"] += 1
+        logger.info(f"📥 Queued TikTok job {job.id[:8]} for {place_id} (depth {self.queue.qsize()})")
+        return job
+
+    def capacity(self) -> int:
+        """How many workers may run jobs right now"""
+        if self.capacity_fn is None:
+            return self.worker_count
+        return max(1, min(self.worker_count, self.capacity_fn()))
+
+    async def _worker(self, index: int):
+        while True:
+            # Park workers beyond the current capacity so jobs stay queued
+            while index >= self.capacity():
+                await asyncio.sleep(self.capacity_poll)
+            _, _, job_id = await self.queue.get()
+            job = self.jobs.get(job_id)
+            try:
+                if job is not None:
+                    await self._run(job)
+            finally:
+                self.queue.task_done()
+
+    async def _scrape(self, job: ScrapeJob) -> Dict[str, Any]:
+        """Scrape the job's place into the cache, raising instead of degrading"""
+        limit = job.limit
+        details = await get_place_details(job.place_id, "id,displayName,formattedAddress")
+        restaurant_name = details.get("displayName", {}).get("text", "")
+        if not restaurant_name:
+            raise ValueError("Restaurant name not found")
+        
+        # Another job or request may have filled the cache while this one waited
+        cached = await tiktok_cache.aget_with_age(tiktok_cache_key(job.place_id))
+        if cached is not None and cached[1] > 0 and tiktok_batch_covers(cached[0], limit):
+            videos = cached[0]["videos"]
         else:
-            # Cache successful results
-            tiktok_cache.set(cache_key, videos, ttl=600)  # 10 minute cache
+            retry_in = tiktok_backoff.retry_in(job.place_id)
+            if retry_in is not None:
+                raise TikTokScrapeError(f"No recent TikTok results, retry in {retry_in:.0f}s")
+            previous = cached[0] if cached is not None else None
+            batch = await scrape_tiktok_into_cache(
+                job.place_id, restaurant_name, max(limit, TIKTOK_SCRAPE_BATCH), previous
+            )
+            videos = batch["videos"] or (previous["videos"] if previous else [])
         
+        if not videos:
+            raise TikTokScrapeError(f"No TikTok videos found for {restaurant_name}")
+        return {
+            "place_id": job.place_id,
+            "restaurant_name": restaurant_name,
+            "videos": videos[:limit],
+            "cached": False,
+            "stale": False
+        }
+
+    async def _run(self, job: ScrapeJob):
+        job.transition("running")
+        try:
+            job.result = await asyncio.wait_for(self._scrape(job), timeout=self.job_timeout)
+            job.transition("done")
+            self.counters["done"] += 1
+        except Exception as e:
+            job.error = str(e) or e.__class__.__name__
+            job.transition("failed")
+            self.counters["failed"] += 1
+            logger.error(f"❌ TikTok job {job.id[:8]} failed: {job.error}")
+        finally:
+            if self.active_by_place.get(job.place_id) is job:
+                del self.active_by_place[job.place_id]
+
+    def _prune(self):
+        """Forget finished jobs older than the retention window"""
+        cutoff = time.time() - self.retention
+        while self.jobs:
+            job = next(iter(self.jobs.values()))
+            if not (job.finished and job.finished_at < cutoff):
+                break
+            self.jobs.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        states: Dict[str, int] = {}
+        for job in self.jobs.values():
+            states[job.state] = states.get(job.state, 0) + 1
         return {
-            "place_id": place_id,
-            "restaurant_name": restaurant_name,
-            "videos": videos,
-            "search_url": tiktok_search_url,
-            "cached": False
+            "depth": self.queue.qsize(),
+            "max_depth": self.max_depth,
+            "workers": len(self.workers),
+            "active_workers": min(len(self.workers), self.capacity()),
+            "states": states,
+            **self.counters
         }
-                
-    except Exception as e:
-        logger.error(f"❌ Error in TikTok endpoint: {str(e)}")
-        # Fallback to placeholders even on critical error
-        try:
-            # Try to get name from request if possible, otherwise use generic
-            name = "Restaurant"
-            tiktok_search_url = "https://www.tiktok.com/"
-            videos = generate_placeholder_videos(name, limit, tiktok_search_url)
-            return {
-                "place_id": place_id,
-                "restaurant_name": name,
-                "videos": videos,
-                "search_url": tiktok_search_url,
-                "error": str(e)
-            }
-        except:
-            return {
-                "place_id": place_id,
-                "videos": [],
-                "error": str(e)
-            }
+
+# Global scrape job queue; workers start with the server
+tiktok_jobs = ScrapeJobQueue(
+    max_depth=int(os.getenv("TIKTOK_JOB_QUEUE_MAX_DEPTH", "100")),
+    # One worker per browser the pool can grow to, gated by its current size
+    workers=int(os.getenv("TIKTOK_JOB_WORKERS", str(BROWSER_POOL_MAX))),
+    capacity_fn=lambda: browser_pool.target_size if browser_pool else BROWSER_POOL_MIN,
+    job_timeout=float(os.getenv("TIKTOK_JOB_TIMEOUT_SECONDS", "90")),
+    retention=float(os.getenv("TIKTOK_JOB_RETENTION_SECONDS", "600"))
+)
+
+@app.post("/restaurants/{place_id}/tiktok-videos/jobs")
+async def submit_tiktok_videos_job(
+    place_id: str,
+    limit: int = Query(4, description="Number of TikTok videos", ge=1),
+    priority: int = Query(5, description="Lower runs first", ge=0, le=9)
+):
+    """
+    Queue a TikTok scrape without holding the request open.
+    Returns 202 with a job to poll at /tiktok-jobs/{job_id} or follow at
+    /tiktok-jobs/{job_id}/events. When the videos are already cached the
+    result is returned straight away with 200.
+    """
+    cached = await tiktok_cache.aget_with_age(tiktok_cache_key(place_id))
+    if cached is not None and tiktok_batch_covers(cached[0], min(limit, TIKTOK_MAX_LIMIT)):
+        return {"state": "done", "result": await get_restaurant_tiktok_videos(place_id, limit=limit)}
+    
+    try:
+        job = tiktok_jobs.submit(place_id, limit, priority)
+    except ScrapeQueueFullError as e:
+        logger.warning(f"🚦 {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    
+    return JSONResponse(
+        status_code=202,
+        content={
+            **job.to_dict(),
+            "poll_url": f"/tiktok-jobs/{job.id}",
+            "events_url": f"/tiktok-jobs/{job.id}/events"
+        }
+    )
+
+@app.get("/tiktok-jobs/{job_id}")
+async def get_tiktok_job(job_id: str):
+    """Poll a TikTok scrape job"""
+    job = tiktok_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job.to_dict()
+
+@app.get("/tiktok-jobs/{job_id}/events")
+async def stream_tiktok_job_events(job_id: str):
+    """
+    Server-sent events for a TikTok scrape job.
+    Emits a "state" event on every transition; the stream ends after the
+    final "done" or "failed" event, which carries the result or error.
+    """
+    job = tiktok_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    async def stream() -> AsyncIterator[str]:
+        while True:
+            changed = job.changed
+            record = job.to_dict()
+            record["type"] = job.state if job.finished else "state"
+            yield format_stream_record(record, "sse")
+            if job.finished:
+                return
+            try:
+                # Periodic re-send doubles as a keep-alive for proxies
+                await asyncio.wait_for(changed.wait(), timeout=15)
+            except asyncio.TimeoutError:
+                pass
+    
+    return StreamingResponse(stream(), media_type=STREAM_MEDIA_TYPES["sse"])
 
 @app.get("/restaurants/photo")
 async def get_restaurant_photo(reference: str, maxwidth: int = 400):
@@ -1359,16 +4696,7 @@ async def get_restaurant_fallback_image(place_id: str):
     """Get a restaurant image from web search as fallback"""
     try:
         # Get restaurant name
-        restaurant_details_url = f"https://places.googleapis.com/v1/places/{place_id}"
-        headers = {
-            "Content-Type": "application/json",
-            "X-Goog-Api-Key": GOOGLE_API_KEY,
-            "X-Goog-FieldMask": "id,displayName,formattedAddress"
-        }
-        
-        response = requests.get(restaurant_details_url, headers=headers)
-        response.raise_for_status()
-        restaurant_data = response.json()
+        restaurant_data = await get_place_details(place_id, "id,displayName,formattedAddress")
         
         restaurant_name = restaurant_data.get("displayName", {}).get("text", "")
         restaurant_address = restaurant_data.get("formattedAddress", "")
@@ -1383,7 +4711,7 @@ async def get_restaurant_fallback_image(place_id: str):
         }
         
         # Make request to Google Images
-        response = requests.get(google_image_url, headers=browser_headers, timeout=10)
+        response = await upstream.get(google_image_url, headers=browser_headers, timeout=10, policy="google_html")
         
         if response.status_code == 200:
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -1436,16 +4764,7 @@ async def get_restaurant_menu_photos(place_id: str):
         logger.info(f"📸 Fetching all photos for place_id: {place_id}")
         
         # Fetch place details with photos
-        url = f"https://places.googleapis.com/v1/places/{place_id}"
-        headers = {
-            "Content-Type": "application/json",
-            "X-Goog-Api-Key": GOOGLE_API_KEY,
-            "X-Goog-FieldMask": "id,displayName,photos"
-        }
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+        data = await get_place_details(place_id, "id,displayName,photos")
         
         all_photos = data.get("photos", [])
         restaurant_name = data.get("displayName", {}).get("text", "Restaurant")
@@ -1490,22 +4809,189 @@ async def get_restaurant_menu_photos(place_id: str):
         
     except Exception as e:
         logger.error(f"❌ Error fetching menu photos: {str(e)}")
-        return {
+        return JSONResponse(status_code=503, content={
             "place_id": place_id,
             "menu_photos": [],
             "total_photos": 0,
             "status": "error",
             "error": str(e),
             "google_maps_url": f"https://www.google.com/maps/place/?q=place_id:{place_id}"
-        }
+        })
 
 
-@app.get("/restaurants/{place_id}/menu-highlights")
-async def get_menu_highlights(place_id: str):
+# ==================== SERPAPI MENU HIGHLIGHTS CLIENT ====================
+# Menus rarely change and every SerpApi lookup costs a credit
+menu_highlights_cache = LRUCache(
+    "menu_highlights",
+    max_entries=int(os.getenv("MENU_HIGHLIGHTS_CACHE_MAX_ENTRIES", "5000")),
+    namespace_ttls={"menu": int(os.getenv("MENU_HIGHLIGHTS_CACHE_TTL_SECONDS", str(7 * 86400)))},
+    persistent=True
+)
+
+def parse_menu_item(item: Dict[str, Any], price_keys: tuple) -> Dict[str, Any]:
+    price_range = []
+    for key in price_keys:
+        if key in item:
+            price_range = item[key]
+            break
+    return {
+        "title": item.get("title", item.get("name", "Menu Item")),
+        "thumbnails": [item.get("thumbnail", item.get("image", ""))],
+        "reviews": item.get("reviews", 0),
+        "photos": item.get("photos", 0),
+        "price_range": price_range,
+        "link": item.get("link", "")
+    }
+
+def parse_menu_highlights(results: Dict[str, Any], limit: int = 8) -> List[Dict[str, Any]]:
+    """Extract menu highlights from a SerpApi google_maps place response"""
+    menu_highlights = []
+    
+    # SerpApi returns menu items in the "menu" or "popular_dishes" field
+    if "menu" in results:
+        menu_data = results["menu"]
+        
+        # Handle different menu data structures from SerpApi
+        if isinstance(menu_data, dict) and "items" in menu_data:
+            items = menu_data["items"]
+        elif isinstance(menu_data, list):
+            items = menu_data
+        else:
+            items = []
+        
+        for item in items[:limit]:
+            menu_item = parse_menu_item(item, ("price_range", "price"))
+            # Only add if we have at least a title
+            if menu_item["title"] and menu_item["title"] != "Menu Item":
+                menu_highlights.append(menu_item)
+    
+    # Also check for popular_dishes field
+    if "popular_dishes" in results and not menu_highlights:
+        for dish in results["popular_dishes"][:limit]:
+            menu_item = parse_menu_item(dish, ("price",))
+            if menu_item["title"] and menu_item["title"] != "Menu Item":
+                menu_highlights.append(menu_item)
+    
+    return menu_highlights
+
+# Places with no menu are re-checked sooner than the menu TTL
+MENU_HIGHLIGHTS_NO_DATA_TTL = int(os.getenv("MENU_HIGHLIGHTS_NO_DATA_TTL_SECONDS", "21600"))
+
+class SerpApiError(Exception):
+    """SerpApi answered with an {"error": ...} payload (quota, invalid key, rate limit)"""
+
+def serpapi_no_results(results: Dict[str, Any]) -> bool:
+    """SerpApi reports an empty search as an error too; that one is a genuine no-data answer"""
+    return "hasn't returned any results" in str(results.get("error", ""))
+
+class SerpApiClient:
     """
-    Get menu highlights for a restaurant using SerpApi to scrape Google Maps menu data.
-    This mirrors the menu tab visible on Google Maps but not available via official Places API.
+    Async wrapper around the blocking SerpApi client.
+    
+    Lookups run on a dedicated thread pool sized to max_concurrency, so
+    SerpApi can neither block the event loop nor starve the default executor
+    that asyncio.to_thread shares. Each call goes through the serpapi
+    upstream policy (timeout, circuit breaker). The HTTP request itself is
+    bounded by request_timeout, which should be below the policy timeout so
+    the thread is free again by the time the policy gives up on it. Parsed
+    menu highlights are cached per place and identical lookups share one call.
     """
+    def __init__(self, api_key: Optional[str], max_concurrency: int = 4, request_timeout: float = 15.0):
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="serpapi")
+        self.in_flight = 0
+        self.calls = 0
+
+    def _search_blocking(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        search = GoogleSearch(query)
+        # Passed to requests in seconds; the library default (60000) never fires
+        search.timeout = self.request_timeout
+        return search.get_dict()
+
+    async def search(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one SerpApi search off the event loop"""
+        loop = asyncio.get_running_loop()
+        query = {**params, "api_key": self.api_key}
+
+        async def attempt():
+            self.calls += 1
+            results = await loop.run_in_executor(self.executor, self._search_blocking, query)
+            # Raised inside the policy so quota/key/rate-limit errors count as failures
+            if "error" in results and not serpapi_no_results(results):
+                raise SerpApiError(results["error"])
+            return results
+
+        self.in_flight += 1
+        try:
+            return await upstream_policies["serpapi"].call(attempt)
+        finally:
+            self.in_flight -= 1
+
+    async def menu_highlights(self, place_id: str) -> Dict[str, Any]:
+        """
+        Menu highlights for one place, from cache when possible.
+        
+        Returns:
+            {"place_id", "menu_highlights", "status"}; lookup errors
+            (including SerpApiError) are raised and never cached, and
+            no_data answers are cached for MENU_HIGHLIGHTS_NO_DATA_TTL only
+        """
+        cache_key = f"menu:{place_id}"
+        cached_highlights = await menu_highlights_cache.aget(cache_key)
+        if cached_highlights is not None:
+            logger.info(f"🎯 Menu highlights cache HIT for {place_id}")
+            return cached_highlights
+
+        async def fetch():
+            logger.info(f"🍽️ Fetching menu highlights for place_id: {place_id}")
+            results = await self.search({"engine": "google_maps", "type": "place", "data_id": place_id})
+            menu_highlights = parse_menu_highlights(results)
+            logger.info(f"✅ Found {len(menu_highlights)} menu items for {place_id}")
+            result = {
+                "place_id": place_id,
+                "menu_highlights": menu_highlights,
+                "status": "success" if menu_highlights else "no_data"
+            }
+            menu_highlights_cache.set(cache_key, result, ttl=None if menu_highlights else MENU_HIGHLIGHTS_NO_DATA_TTL)
+            return result
+
+        return await single_flight.do("serpapi", place_id, fetch)
+
+    async def menu_highlights_batch(self, place_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Menu highlights for several places at once, in input order.
+        Cached places are answered immediately; the rest share the client's
+        concurrency limit. Failures are returned with status "error".
+        """
+        async def one(place_id: str) -> Dict[str, Any]:
+            try:
+                return await self.menu_highlights(place_id)
+            except Exception as e:
+                logger.error(f"❌ Error fetching menu highlights for {place_id}: {str(e)}")
+                return {"place_id": place_id, "menu_highlights": [], "status": "error", "error": str(e)}
+
+        return await asyncio.gather(*(one(place_id) for place_id in dict.fromkeys(place_ids)))
+
+    def stats(self) -> Dict[str, int]:
+        return {"max_concurrency": self.max_concurrency, "in_flight": self.in_flight, "calls": self.calls}
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+# Global SerpApi client instance
+serpapi_client = SerpApiClient(
+    SERPAPI_KEY,
+    max_concurrency=int(os.getenv("SERPAPI_MAX_CONCURRENCY", "4")),
+    request_timeout=min(
+        float(os.getenv("SERPAPI_REQUEST_TIMEOUT_SECONDS", "15")),
+        upstream_policies["serpapi"].timeout * 0.75
+    )
+)
+
+def menu_highlights_unavailable(place_id: str) -> Optional[Dict[str, Any]]:
+    """Response for places SerpApi can't be asked about, or None if it can"""
     # Skip API call for fallback IDs
     if place_id.startswith("fallback-"):
         return {
@@ -1513,84 +4999,28 @@ async def get_menu_highlights(place_id: str):
             "menu_highlights": [],
             "status": "unavailable"
         }
-    
-    try:
-        # First check if SerpApi key is available
-        if not SERPAPI_KEY:
-            logger.warning("⚠️ SERPAPI_KEY not configured - returning empty menu")
-            return {
-                "place_id": place_id,
-                "menu_highlights": [],
-                "status": "api_key_missing",
-                "message": "Menu highlights require SerpApi configuration"
-            }
-        
-        logger.info(f"🍽️ Fetching menu highlights for place_id: {place_id}")
-        
-        # Use SerpApi to get Google Maps menu highlights
-        params = {
-            "engine": "google_maps",
-            "type": "place",
-            "data_id": place_id,
-            "api_key": SERPAPI_KEY
-        }
-        
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        
-        # Extract menu highlights from SerpApi response
-        menu_highlights = []
-        
-        # SerpApi returns menu items in the "menu" or "popular_dishes" field
-        if "menu" in results:
-            menu_data = results["menu"]
-            
-            # Handle different menu data structures from SerpApi
-            if isinstance(menu_data, dict) and "items" in menu_data:
-                items = menu_data["items"]
-            elif isinstance(menu_data, list):
-                items = menu_data
-            else:
-                items = []
-            
-            for item in items[:8]:  # Limit to 8 items for preview
-                menu_item = {
-                    "title": item.get("title", item.get("name", "Menu Item")),
-                    "thumbnails": [item.get("thumbnail", item.get("image", ""))],
-                    "reviews": item.get("reviews", 0),
-                    "photos": item.get("photos", 0),
-                    "price_range": item.get("price_range", item.get("price", [])),
-                    "link": item.get("link", "")
-                }
-                
-                # Only add if we have at least a title
-                if menu_item["title"] and menu_item["title"] != "Menu Item":
-                    menu_highlights.append(menu_item)
-        
-        # Also check for popular_dishes field
-        if "popular_dishes" in results and not menu_highlights:
-            dishes = results["popular_dishes"]
-            for dish in dishes[:8]:
-                menu_item = {
-                    "title": dish.get("title", dish.get("name", "Menu Item")),
-                    "thumbnails": [dish.get("thumbnail", dish.get("image", ""))],
-                    "reviews": dish.get("reviews", 0),
-                    "photos": dish.get("photos", 0),
-                    "price_range": dish.get("price", []),
-                    "link": dish.get("link", "")
-                }
-                
-                if menu_item["title"] and menu_item["title"] != "Menu Item":
-                    menu_highlights.append(menu_item)
-        
-        logger.info(f"✅ Found {len(menu_highlights)} menu items for {place_id}")
-        
+    if not SERPAPI_KEY:
+        logger.warning("⚠️ SERPAPI_KEY not configured - returning empty menu")
         return {
             "place_id": place_id,
-            "menu_highlights": menu_highlights,
-            "status": "success" if menu_highlights else "no_data"
+            "menu_highlights": [],
+            "status": "api_key_missing",
+            "message": "Menu highlights require SerpApi configuration"
         }
-        
+    return None
+
+@app.get("/restaurants/{place_id}/menu-highlights")
+async def get_menu_highlights(place_id: str):
+    """
+    Get menu highlights for a restaurant using SerpApi to scrape Google Maps menu data.
+    This mirrors the menu tab visible on Google Maps but not available via official Places API.
+    """
+    unavailable = menu_highlights_unavailable(place_id)
+    if unavailable is not None:
+        return unavailable
+    
+    try:
+        return await serpapi_client.menu_highlights(place_id)
     except Exception as e:
         logger.error(f"❌ Error fetching menu highlights: {str(e)}")
         return {
@@ -1600,23 +5030,267 @@ async def get_menu_highlights(place_id: str):
             "error": str(e)
         }
 
+@app.post("/restaurants/menu-highlights")
+async def get_menu_highlights_batch(request: PlaceDetailsRequest):
+    """
+    Fetch menu highlights for multiple place IDs
+    Returns one entry per unique place ID, in request order
+    """
+    logger.info(f"🍽️ Fetching menu highlights for {len(request.place_ids)} places")
+    results = {}
+    pending = []
+    for place_id in request.place_ids:
+        unavailable = menu_highlights_unavailable(place_id)
+        if unavailable is not None:
+            results[place_id] = unavailable
+        else:
+            pending.append(place_id)
+    
+    for result in await serpapi_client.menu_highlights_batch(pending):
+        results[result["place_id"]] = result
+    return {"places": [results[place_id] for place_id in dict.fromkeys(request.place_ids)]}
+
+
+# ==================== RESTAURANT BUNDLE ENDPOINT ====================
+# Per-section deadlines in seconds; slow sections keep running in the
+# background after their deadline so the next request hits a warm cache
+BUNDLE_SECTION_DEADLINES = {
+    "details": 5.0,
+    "reviews": 5.0,
+    "menu_photos": 5.0,
+    "menu_highlights": 8.0,
+    "tiktok_links": 5.0,
+    "tiktok_videos": float(os.getenv("BUNDLE_TIKTOK_DEADLINE_SECONDS", "10")),
+}
+
+# Strong references so background section tasks aren't garbage collected
+bundle_background_tasks: set = set()
+
+@app.get("/restaurants/{place_id}/bundle")
+async def get_restaurant_bundle(
+    place_id: str,
+    sections: Optional[str] = Query(None, description="Comma-separated sections (default: all)"),
+    tiktok_limit: int = Query(4, description="Number of TikTok videos", ge=1, le=12)
+):
+    """
+    Fetch several detail-screen sections in one round trip.
+    Sections run concurrently, each under its own deadline. Each section
+    reports status ok / error / timeout, so slow sections (e.g. the TikTok
+    scrape) don't hold back the rest of the response.
+    """
+    section_fetchers = {
+        "details": lambda: get_restaurant_details(place_id),
+        "reviews": lambda: get_restaurant_reviews(place_id),
+        "menu_photos": lambda: get_restaurant_menu_photos(place_id),
+        "menu_highlights": lambda: get_menu_highlights(place_id),
+        "tiktok_links": lambda: get_restaurant_tiktok_links(place_id),
+        "tiktok_videos": lambda: get_restaurant_tiktok_videos(place_id, limit=tiktok_limit),
+    }
+
+    requested = [s.strip() for s in sections.split(",") if s.strip()] if sections else list(section_fetchers)
+    unknown = [s for s in requested if s not in section_fetchers]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sections: {', '.join(unknown)}. Valid sections: {', '.join(section_fetchers)}"
+        )
+
+    logger.info(f"📦 Fetching bundle for {place_id}: {requested}")
+    start_time = time.time()
+
+    tasks = {name: asyncio.ensure_future(section_fetchers[name]()) for name in requested}
+
+    async def collect(name: str) -> Dict[str, Any]:
+        task = tasks[name]
+        deadline = BUNDLE_SECTION_DEADLINES[name]
+        # wait() instead of wait_for() so a missed deadline doesn't cancel the work
+        done, _ = await asyncio.wait({task}, timeout=deadline)
+        elapsed_ms = round((time.time() - start_time) * 1000)
+        if not done:
+            bundle_background_tasks.add(task)
+            task.add_done_callback(bundle_background_tasks.discard)
+            logger.warning(f"⏱️ Bundle section '{name}' missed its {deadline}s deadline")
+            return {"status": "timeout", "deadline_ms": round(deadline * 1000), "elapsed_ms": elapsed_ms}
+        try:
+            result = task.result()
+            # Handlers that keep their body on failure return a Response with an error status
+            if isinstance(result, Response):
+                body = json.loads(result.body) if result.body else None
+                if result.status_code >= 400:
+                    error = body.get("error") if isinstance(body, dict) else None
+                    return {"status": "error", "error": error or body, "status_code": result.status_code, "elapsed_ms": elapsed_ms}
+                result = body
+            return {"status": "ok", "data": result, "elapsed_ms": elapsed_ms}
+        except HTTPException as e:
+            return {"status": "error", "error": e.detail, "status_code": e.status_code, "elapsed_ms": elapsed_ms}
+        except Exception as e:
+            logger.error(f"❌ Bundle section '{name}' failed: {str(e)}")
+            return {"status": "error", "error": str(e), "elapsed_ms": elapsed_ms}
+
+    results = await asyncio.gather(*(collect(name) for name in requested))
+
+    return {
+        "place_id": place_id,
+        "sections": dict(zip(requested, results)),
+        "elapsed_ms": round((time.time() - start_time) * 1000)
+    }
+
 
 # Google Places API (New) Proxy Endpoints for Location Search
+# ==================== AUTOCOMPLETE PREFIX CACHE ====================
+# Places Autocomplete (New) returns at most this many suggestions; a shorter
+# list is every match for that input
+AUTOCOMPLETE_MAX_PREDICTIONS = 5
+
+class AutocompleteTrieNode:
+    __slots__ = ("children", "entry")
+
+    def __init__(self):
+        self.children: Dict[str, "AutocompleteTrieNode"] = {}
+        # (predictions, complete, expiry) or None
+        self.entry: Optional[tuple] = None
+
+class AutocompletePrefixCache:
+    """
+    Autocomplete predictions cached in a per-language character trie.
+    
+    An exact input is answered from its own node. A longer input with no
+    entry of its own is answered by filtering the predictions of the deepest
+    cached prefix, provided that prefix's result set was complete (fewer
+    than AUTOCOMPLETE_MAX_PREDICTIONS): every match for the longer input
+    must then be among them. Entries are bounded LRU-wise by max_entries.
+    """
+    def __init__(self, ttl: int = 86400, max_entries: int = 20000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.roots: Dict[str, AutocompleteTrieNode] = {}
+        # (language, normalized input) -> node holding an entry, oldest first
+        self.lru: "OrderedDict[tuple, AutocompleteTrieNode]" = OrderedDict()
+        self.counters = {"exact_hits": 0, "prefix_hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    @staticmethod
+    def prediction_matches(prediction: Dict[str, Any], text: str) -> bool:
+        """Google matches each typed word as a prefix of some word in the suggestion"""
+        words = re.findall(r"\w+", prediction.get("description", "").lower())
+        return all(any(word.startswith(term) for word in words) for term in re.findall(r"\w+", text))
+
+    def lookup(self, text: str, language: str) -> Optional[tuple]:
+        """
+        Returns:
+            (predictions, source) with source "exact" or "prefix", or None on a miss
+        """
+        text = self.normalize(text)
+        node = self.roots.get(language)
+        now = time.time()
+        best_prefix = None
+
+        for depth, char in enumerate(text):
+            node = node.children.get(char) if node else None
+            if node is None:
+                break
+            if node.entry is None:
+                continue
+            if now >= node.entry[2]:
+                self._drop(language, text[:depth + 1])
+                continue
+            if depth + 1 == len(text):
+                self.lru.move_to_end((language, text))
+                self.counters["exact_hits"] += 1
+                return node.entry[0], "exact"
+            if node.entry[1]:
+                best_prefix = (text[:depth + 1], node.entry[0])
+
+        if best_prefix is not None:
+            prefix, predictions = best_prefix
+            self.lru.move_to_end((language, prefix))
+            self.counters["prefix_hits"] += 1
+            return [p for p in predictions if self.prediction_matches(p, text)], "prefix"
+
+        self.counters["misses"] += 1
+        return None
+
+    def store(self, text: str, language: str, predictions: List[Dict[str, Any]]):
+        text = self.normalize(text)
+        if not text:
+            return
+        node = self.roots.setdefault(language, AutocompleteTrieNode())
+        for char in text:
+            node = node.children.setdefault(char, AutocompleteTrieNode())
+        node.entry = (predictions, len(predictions) < AUTOCOMPLETE_MAX_PREDICTIONS, time.time() + self.ttl)
+        self.lru[(language, text)] = node
+        self.lru.move_to_end((language, text))
+
+        while len(self.lru) > self.max_entries:
+            language_evicted, text_evicted = next(iter(self.lru))
+            self._drop(language_evicted, text_evicted)
+            self.counters["evictions"] += 1
+
+    def _drop(self, language: str, text: str):
+        """Remove an entry and prune the branch nodes it alone kept alive"""
+        self.lru.pop((language, text), None)
+        path = [self.roots.get(language)]
+        for char in text:
+            if path[-1] is None:
+                return
+            path.append(path[-1].children.get(char))
+        if path[-1] is None:
+            return
+        path[-1].entry = None
+        for depth in range(len(text), 0, -1):
+            node = path[depth]
+            if node.entry is not None or node.children:
+                break
+            del path[depth - 1].children[text[depth - 1]]
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self.lru), **self.counters}
+
+    def clear(self):
+        self.roots.clear()
+        self.lru.clear()
+
+# Global autocomplete cache instance
+autocomplete_cache = AutocompletePrefixCache(
+    ttl=int(os.getenv("AUTOCOMPLETE_CACHE_TTL_SECONDS", "86400")),
+    max_entries=int(os.getenv("AUTOCOMPLETE_CACHE_MAX_ENTRIES", "20000"))
+)
+
 @app.post("/places/autocomplete")
 async def places_autocomplete(request: dict = Body(...)):
     """
     Proxy endpoint for Google Places API (New) Autocomplete
     This prevents CORS issues when calling from the frontend
     Uses the new Places API endpoint with POST method
+    
+    Answered from the prefix cache when possible. Pass the same
+    session_token for every keystroke of one search (and to /places/details
+    for the chosen place) so Google bills the session once; a token is
+    generated and returned when none is sent.
     """
     try:
         input_text = request.get("input")
         language = request.get("language", "en")
+        session_token = request.get("session_token") or request.get("sessionToken") or str(uuid.uuid4())
         
         if not input_text:
             logger.error("❌ input not provided in request")
             raise HTTPException(status_code=400, detail="input is required")
         
+        cached = autocomplete_cache.lookup(input_text, language)
+        if cached is not None:
+            predictions, source = cached
+            logger.info(f"🎯 Autocomplete cache HIT ({source}) for '{input_text}'")
+            return {
+                "status": "OK" if predictions else "ZERO_RESULTS",
+                "predictions": predictions,
+                "session_token": session_token,
+                "cached": source
+            }
+        
         logger.info(f"🔍 Places autocomplete search (New API): '{input_text}'")
         
         if not GOOGLE_API_KEY:
@@ -1624,25 +5298,21 @@ async def places_autocomplete(request: dict = Body(...)):
             raise HTTPException(status_code=500, detail="Server configuration error: API key not found")
         
         # New Places API endpoint
-        url = "https://places.googleapis.com/v1/places:autocomplete"
-        
-        headers = {
-            "Content-Type": "application/json",
-            "X-Goog-Api-Key": GOOGLE_API_KEY,
-            "X-Goog-FieldMask": "suggestions.placePrediction.placeId,suggestions.placePrediction.text,suggestions.placePrediction.structuredFormat"
-        }
+        url = f"{PLACES_API_BASE}/places:autocomplete"
+        field_mask = "suggestions.placePrediction.placeId,suggestions.placePrediction.text,suggestions.placePrediction.structuredFormat"
         
         # Request body for new API
         payload = {
             "input": input_text,
             "languageCode": language,
-            "includedPrimaryTypes": ["geocode"]  # Equivalent to types=geocode in legacy API
+            "includedPrimaryTypes": ["geocode"],  # Equivalent to types=geocode in legacy API
+            "sessionToken": session_token
         }
         
         logger.info(f"📡 Calling Google Places API (New): {url}")
         logger.debug(f"📋 Payload: {payload}")
         
-        response = requests.post(url, json=payload, headers=headers)
+        response = await upstream.places_post("places:autocomplete", payload, field_mask)
         response.raise_for_status()
         
         data = response.json()
@@ -1670,18 +5340,22 @@ async def places_autocomplete(request: dict = Body(...)):
                 })
             
             logger.info(f"✅ Found {len(predictions)} predictions")
+            autocomplete_cache.store(input_text, language, predictions)
             return {
                 "status": "OK",
-                "predictions": predictions
+                "predictions": predictions,
+                "session_token": session_token
             }
         else:
             logger.info("ℹ️ No predictions found")
+            autocomplete_cache.store(input_text, language, [])
             return {
                 "status": "ZERO_RESULTS",
-                "predictions": []
+                "predictions": [],
+                "session_token": session_token
             }
         
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         error_detail = e.response.text if hasattr(e.response, 'text') else str(e)
         logger.error(f"❌ HTTP Error from Google API: {error_detail}")
         logger.error(f"🔑 API Key (first 10 chars): {GOOGLE_API_KEY[:10]}...")
@@ -1712,20 +5386,17 @@ async def places_details(request: dict = Body(...)):
             raise HTTPException(status_code=500, detail="Server configuration error: API key not found")
         
         # New Places API endpoint
-        url = f"https://places.googleapis.com/v1/places/{place_id}"
-        
-        headers = {
-            "Content-Type": "application/json",
-            "X-Goog-Api-Key": GOOGLE_API_KEY,
-            "X-Goog-FieldMask": "location,formattedAddress,displayName"
-        }
+        url = f"{PLACES_API_BASE}/places/{place_id}"
         
         logger.info(f"📡 Calling Google Places API (New): {url}")
         
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
+        session_token = request.get("session_token") or request.get("sessionToken")
+        data = await get_place_details(
+            place_id,
+            "location,formattedAddress,displayName",
+            prefetch=False,
+            session_token=session_token
+        )
         
         # Log the full response for debugging
         logger.debug(f"📦 Full Google API response: {data}")
@@ -1754,7 +5425,7 @@ async def places_details(request: dict = Body(...)):
                 "result": {}
             }
         
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         error_detail = e.response.text if hasattr(e.response, 'text') else str(e)
         logger.error(f"❌ HTTP Error from Google API: {error_detail}")
         logger.error(f"🔑 API Key (first 10 chars): {GOOGLE_API_KEY[:10]}...")
@@ -1764,11 +5435,201 @@ async def places_details(request: dict = Body(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ==================== REVERSE GEOCODING ====================
+# Decimal places coordinates are rounded to for the result cache
+# (4 ≈ 11 m, 3 ≈ 110 m); GPS fixes from one spot land on the same key
+REVERSE_GEOCODE_PRECISION = int(os.getenv("REVERSE_GEOCODE_PRECISION", "4"))
+# Furthest a gazetteer centroid may be from the fix and still answer for it
+REVERSE_GEOCODE_MAX_DISTANCE_M = float(os.getenv("REVERSE_GEOCODE_MAX_DISTANCE_M", "100"))
+
+# Reverse geocodes, persisted so the first app open after a deploy stays free
+geocode_cache = LRUCache(
+    "geocode",
+    max_entries=int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "10000")),
+    namespace_ttls={"geocode": int(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(30 * 86400)))},
+    persistent=True
+)
+
+def quantized_geocode_key(lat: float, lng: float, precision: int = REVERSE_GEOCODE_PRECISION) -> str:
+    return f"geocode:{precision}:{round(lat, precision):.{precision}f},{round(lng, precision):.{precision}f}"
+
+def unit_vector(lat: float, lng: float) -> tuple:
+    """Point on the unit sphere; straight-line distance between these orders like great-circle distance"""
+    lat_r, lng_r = math.radians(lat), math.radians(lng)
+    return (math.cos(lat_r) * math.cos(lng_r), math.cos(lat_r) * math.sin(lng_r), math.sin(lat_r))
+
+class KDTree:
+    """Static 3-d tree over unit-sphere points for nearest-neighbour lookups"""
+    def __init__(self, points: List[tuple], payloads: List[Any]):
+        self.size = len(points)
+        # node: (point, payload, axis, left, right)
+        self.root = self._build(list(zip(points, payloads)), 0)
+
+    def _build(self, items: List[tuple], depth: int) -> Optional[tuple]:
+        if not items:
+            return None
+        axis = depth % 3
+        items.sort(key=lambda item: item[0][axis])
+        mid = len(items) // 2
+        return (
+            items[mid][0], items[mid][1], axis,
+            self._build(items[:mid], depth + 1),
+            self._build(items[mid + 1:], depth + 1)
+        )
+
+    def nearest(self, target: tuple) -> Optional[tuple]:
+        """
+        Returns:
+            (payload, squared chord distance) of the closest point, or None if empty
+        """
+        best = [None, float("inf")]
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point, payload, axis, left, right = node
+            dx, dy, dz = point[0] - target[0], point[1] - target[1], point[2] - target[2]
+            distance = dx * dx + dy * dy + dz * dz
+            if distance < best[1]:
+                best[0], best[1] = payload, distance
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Visit the far side only if the splitting plane is closer than the best so far
+            if diff * diff < best[1]:
+                stack.append(far)
+            stack.append(near)
+        return (best[0], best[1]) if best[0] is not None else None
+
+class LocalGazetteer:
+    """
+    Address and neighbourhood centroids answered without calling Google.
+    
+    Loaded from a CSV (header: lat,lng,formatted_address[,types][,radius_m])
+    or a JSON list of objects with the same keys. types is a '|'-separated
+    list in CSV. radius_m overrides REVERSE_GEOCODE_MAX_DISTANCE_M per entry,
+    e.g. larger for neighbourhood centroids than for street addresses.
+    """
+    def __init__(self, entries: List[Dict[str, Any]], path: str = ""):
+        self.path = path
+        self.tree = KDTree([unit_vector(e["lat"], e["lng"]) for e in entries], entries)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str) -> "LocalGazetteer":
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f) if path.endswith(".json") else list(csv.DictReader(f))
+
+        entries = []
+        for row in rows:
+            types = row.get("types") or []
+            if isinstance(types, str):
+                types = [t for t in types.split("|") if t]
+            entries.append({
+                "lat": float(row["lat"]),
+                "lng": float(row["lng"]),
+                "formatted_address": row["formatted_address"],
+                "types": types,
+                "radius_m": float(row["radius_m"]) if row.get("radius_m") else None
+            })
+        return cls(entries, path)
+
+    def lookup(self, lat: float, lng: float) -> Optional[Dict[str, Any]]:
+        """Nearest centroid within its radius, as a Geocoding-API-shaped result"""
+        found = self.tree.nearest(unit_vector(lat, lng))
+        if found is not None:
+            entry, chord_sq = found
+            distance_m = 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(chord_sq) / 2))
+            if distance_m <= (entry["radius_m"] or REVERSE_GEOCODE_MAX_DISTANCE_M):
+                self.hits += 1
+                return {
+                    "formatted_address": entry["formatted_address"],
+                    "geometry": {"location": {"lat": entry["lat"], "lng": entry["lng"]}},
+                    "types": entry["types"],
+                    "distance_m": round(distance_m, 1)
+                }
+        self.misses += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "entries": self.tree.size, "hits": self.hits, "misses": self.misses}
+
+def load_gazetteer() -> Optional[LocalGazetteer]:
+    """Load the optional gazetteer from REVERSE_GEOCODE_GAZETTEER"""
+    path = os.getenv("REVERSE_GEOCODE_GAZETTEER")
+    if not path:
+        return None
+    try:
+        gazetteer = LocalGazetteer.load(path)
+        logger.info(f"🗺️ Loaded {gazetteer.tree.size} gazetteer entries from {path}")
+        return gazetteer
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"⚠️ Gazetteer disabled, could not load {path}: {str(e)}")
+        return None
+
+gazetteer = load_gazetteer()
+
+async def reverse_geocode_lookup(lat: float, lng: float) -> Dict[str, Any]:
+    """
+    Reverse geocode through the quantized cache, then the local gazetteer,
+    and only then Google.
+    
+    Returns:
+        {"status", "formatted_address", "results", "source"}
+    """
+    cache_key = quantized_geocode_key(lat, lng)
+    cached_result = await geocode_cache.aget(cache_key)
+    if cached_result is not None:
+        return {**cached_result, "source": "cache"}
+    
+    if gazetteer is not None:
+        local_result = gazetteer.lookup(lat, lng)
+        if local_result is not None:
+            logger.info(f"🗺️ Reverse geocoded locally to: {local_result['formatted_address']}")
+            return {
+                "status": "OK",
+                "formatted_address": local_result["formatted_address"],
+                "results": [local_result],
+                "source": "gazetteer"
+            }
+    
+    # Use Google Geocoding API (legacy)
+    params = {
+        "latlng": f"{lat},{lng}",
+        "key": GOOGLE_API_KEY
+    }
+    
+    response = await upstream.get(GEOCODE_API_URL, params=params, policy="geocoding")
+    response.raise_for_status()
+    
+    data = response.json()
+    
+    if data.get("status") == "OK" and data.get("results"):
+        formatted_address = data["results"][0].get("formatted_address", "Unknown Location")
+        logger.info(f"✅ Reverse geocoded to: {formatted_address}")
+        result = {
+            "status": "OK",
+            "formatted_address": formatted_address,
+            "results": data["results"]
+        }
+        geocode_cache.set(cache_key, result)
+        return {**result, "source": "google"}
+    
+    logger.warning(f"⚠️ Reverse geocoding failed: {data.get('status')}")
+    return {
+        "status": data.get("status", "ZERO_RESULTS"),
+        "formatted_address": "Current Location",
+        "results": [],
+        "source": "google"
+    }
+
 @app.post("/places/reverse-geocode")
 async def reverse_geocode(request: dict):
     """
     Reverse geocode coordinates to get address
-    Uses Google Geocoding API
+    Answered from the quantized cache or local gazetteer when possible,
+    otherwise uses Google Geocoding API
     """
     try:
         latitude = request.get("latitude")
@@ -1778,34 +5639,7 @@ async def reverse_geocode(request: dict):
             raise HTTPException(status_code=400, detail="Missing latitude or longitude")
         
         logger.info(f"📍 Reverse geocoding coordinates: ({latitude}, {longitude})")
-        
-        # Use Google Geocoding API (legacy)
-        url = "https://maps.googleapis.com/maps/api/geocode/json"
-        params = {
-            "latlng": f"{latitude},{longitude}",
-            "key": GOOGLE_API_KEY
-        }
-        
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if data.get("status") == "OK" and data.get("results"):
-            formatted_address = data["results"][0].get("formatted_address", "Unknown Location")
-            logger.info(f"✅ Reverse geocoded to: {formatted_address}")
-            return {
-                "status": "OK",
-                "formatted_address": formatted_address,
-                "results": data["results"]
-            }
-        else:
-            logger.warning(f"⚠️ Reverse geocoding failed: {data.get('status')}")
-            return {
-                "status": data.get("status", "ZERO_RESULTS"),
-                "formatted_address": "Current Location",
-                "results": []
-            }
+        return await reverse_geocode_lookup(float(latitude), float(longitude))
         
     except Exception as e:
         logger.error(f"❌ Error reverse geocoding: {str(e)}")
@@ -1815,17 +5649,40 @@ async def reverse_geocode(request: dict):
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize browser pool on server startup"""
-    global browser_pool
+    """Initialize browser pool and cache sweeper on server startup"""
+    global browser_pool, cache_sweeper_task, persistent_cache, shared_cache
     
     logger.info("🚀 Starting FastAPI server...")
+    
+    persistent_cache = open_persistent_cache()
+    attach_persistent_cache(persistent_cache)
+    shared_cache = open_shared_cache()
     logger.info("🎭 Initializing Playwright browser pool...")
     
-    browser_pool = BrowserPool(pool_size=2)
+    browser_pool = BrowserPool(
+        pool_size=BROWSER_POOL_MIN,
+        min_size=BROWSER_POOL_MIN,
+        max_size=BROWSER_POOL_MAX,
+        backlog_fn=lambda: tiktok_jobs.queue.qsize(),
+        warmup=scrape_pages.warm,
+        scale_up_cooldown=float(os.getenv("BROWSER_SCALE_UP_COOLDOWN_SECONDS", "30")),
+        scale_down_idle=float(os.getenv("BROWSER_SCALE_DOWN_IDLE_SECONDS", "300")),
+        min_free_memory_bytes=int(os.getenv("BROWSER_MIN_FREE_MEMORY_MB", "300")) * 1024 * 1024,
+        max_contexts=int(os.getenv("BROWSER_MAX_CONTEXTS", "200")),
+        max_age=float(os.getenv("BROWSER_MAX_AGE_SECONDS", "1800")),
+        max_rss_bytes=int(os.getenv("BROWSER_MAX_RSS_MB", "350")) * 1024 * 1024,
+        acquire_timeout=float(os.getenv("BROWSER_ACQUIRE_TIMEOUT_SECONDS", "30")),
+        health_interval=float(os.getenv("BROWSER_HEALTH_INTERVAL_SECONDS", "60"))
+    )
     await browser_pool.initialize()
     
     logger.info("✅ Browser pool ready")
-    logger.info("💾 TikTok cache initialized (10-minute TTL)")
+    if persistent_cache:
+        logger.info(f"💽 Warmed {await warm_caches_from_disk()} cache entries from disk")
+    cache_sweeper_task = asyncio.create_task(cache_sweeper())
+    tiktok_jobs.start()
+    logger.info(f"📥 {tiktok_jobs.worker_count} TikTok scrape workers running")
+    logger.info(f"💾 Cache sweeper running every {CACHE_SWEEP_INTERVAL}s")
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -1834,12 +5691,28 @@ async def shutdown_event():
     
     logger.info("🛑 Shutting down FastAPI server...")
     
+    if cache_sweeper_task:
+        cache_sweeper_task.cancel()
+    tiktok_refresher.cancel_all()
+    await tiktok_jobs.stop()
+    
     if browser_pool:
         logger.info("🧹 Closing browser pool...")
         await browser_pool.close()
     
+    logger.info("🧹 Closing upstream HTTP client...")
+    await upstream.close()
+    
     logger.info("🧹 Clearing TikTok cache...")
     tiktok_cache.clear()
+    place_details_cache.clear()
+    geo_tile_cache.clear()
+    place_index.clear()
+    autocomplete_cache.clear()
+    await shared_cache.close()
+    serpapi_client.close()
+    if persistent_cache:
+        await persistent_cache.close()
     
     logger.info("✅ Cleanup complete")
 
@@ -0,0 +1,33 @@
+"""
+Restaurant bundle sections when the Places API is down.
+
+get_place_details is replaced with a mock that fails like a Places outage,
+so handlers that answer with an error Response must show up as "error"
+sections rather than "ok" ones wrapping the Response object.
+
+Run from Backend/ with: python -m pytest tests
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PERSISTENT_CACHE_PATH", "")
+
+import app  # noqa: E402
+
+
+def test_bundle_reports_places_outage_as_errors(monkeypatch):
+    async def failing_place_details(place_id, field_mask, **kwargs):
+        raise app.CircuitOpenError("places", 30)
+
+    monkeypatch.setattr(app, "get_place_details", failing_place_details)
+
+    bundle = asyncio.run(app.get_restaurant_bundle("place-123", sections="details,reviews,menu_photos", tiktok_limit=4))
+
+    for name in ("details", "reviews", "menu_photos"):
+        section = bundle["sections"][name]
+        assert section["status"] == "error", name
+        assert section["status_code"] == 503, name
+        assert "circuit open" in section["error"], name
+        assert "data" not in section, name
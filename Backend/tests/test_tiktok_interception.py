@@ -0,0 +1,152 @@
+"""
+TikTok scraper against a local stand-in for tiktok.com.
+
+The stand-in serves a canned search page whose script fetches a canned
+search API payload (like the real page's XHR), or, with the API disabled,
+renders the results straight into the DOM. TIKTOK_BASE_URL is pointed at
+it, so the scraper runs end to end with a real headless Chromium.
+
+Run from Backend/ with: python -m pytest tests
+Skipped when Chromium isn't installed (playwright install chromium).
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PERSISTENT_CACHE_PATH", "")
+
+import app  # noqa: E402
+
+API_ITEMS = [
+    {
+        "id": f"73000000000000000{i}",
+        "desc": f"Best pasta in town #{i}",
+        "author": {"uniqueId": f"foodie{i}"},
+        "video": {"cover": f"https://cdn.example/cover{i}.jpg"}
+    }
+    for i in range(1, 6)
+]
+
+# Fetches the search API like TikTok's page does; searches mentioning
+# "dom-only" render result cards instead and never call the API
+SEARCH_PAGE = """<!doctype html>
+<html><body><div id="results"></div>
+<script>
+const params = new URLSearchParams(location.search);
+if ((params.get("q") || "").includes("dom-only")) {
+    const results = document.getElementById("results");
+    for (let i = 1; i <= 3; i++) {
+        results.insertAdjacentHTML("beforeend",
+            `<div data-e2e="search_video-item">
+                <a href="/@domuser${i}/video/${i}"><img src="/cover${i}.jpg"></a>
+                <div data-e2e="search-card-desc">DOM video ${i}</div>
+            </div>`);
+    }
+} else {
+    fetch("/api/search/general/full/?keyword=" + encodeURIComponent(params.get("q") || ""))
+        .then(response => response.json());
+}
+</script>
+</body></html>
+"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parsed = urllib.parse.urlparse(self.path)
+        if parsed.path == "/search":
+            self._send(200, "text/html", SEARCH_PAGE.encode())
+        elif parsed.path == "/api/search/general/full/":
+            payload = {"data": [{"type": 1, "item": item} for item in API_ITEMS] + [{"type": 4, "user_list": []}]}
+            self._send(200, "application/json", json.dumps(payload).encode())
+        else:
+            self._send(404, "text/plain", b"not found")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def scraper(stand_in, monkeypatch):
+    """Run a coroutine factory against a real one-browser pool pointed at the stand-in"""
+    monkeypatch.setattr(app, "TIKTOK_BASE_URL", stand_in)
+    monkeypatch.setattr(app, "TIKTOK_API_WAIT_MS", 1500)
+    monkeypatch.delenv("TIKTOK_PROXY_URL", raising=False)
+
+    def run(scenario):
+        async def main():
+            pool = app.BrowserPool(pool_size=1, health_interval=3600, warmup=app.scrape_pages.warm)
+            try:
+                await pool.initialize()
+            except Exception as e:
+                if pool.playwright:
+                    await pool.playwright.stop()
+                pytest.skip(f"Chromium unavailable: {e}")
+            monkeypatch.setattr(app, "browser_pool", pool)
+            try:
+                return await scenario()
+            finally:
+                await pool.close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_intercepts_search_api(scraper, stand_in):
+    videos = scraper(lambda: app.scrape_tiktok_videos_playwright("Pasta Place", limit=4, timeout=10000))
+
+    assert [video["url"] for video in videos] == [
+        f"{stand_in}/@foodie{i}/video/{API_ITEMS[i - 1]['id']}" for i in range(1, 5)
+    ]
+    assert videos[0] == {
+        "id": "video-1",
+        "thumbnail": "https://cdn.example/cover1.jpg",
+        "url": f"{stand_in}/@foodie1/video/{API_ITEMS[0]['id']}",
+        "description": "Best pasta in town #1"
+    }
+
+
+def test_returns_fewer_when_api_runs_out(scraper):
+    videos = scraper(lambda: app.scrape_tiktok_videos_playwright("Pasta Place", limit=10, timeout=10000))
+
+    assert len(videos) == len(API_ITEMS)
+
+
+def test_falls_back_to_dom_without_api_response(scraper, stand_in):
+    videos = scraper(lambda: app.scrape_tiktok_videos_playwright("dom-only cafe", limit=2, timeout=10000))
+
+    assert [video["url"] for video in videos] == [f"{stand_in}/@domuser1/video/1", f"{stand_in}/@domuser2/video/2"]
+    assert videos[0]["description"] == "DOM video 1"
+
+
+def test_dom_only_mode_skips_interception(scraper, monkeypatch):
+    monkeypatch.setattr(app, "TIKTOK_EXTRACTION_MODE", "dom")
+
+    # The API-backed page renders no cards, so DOM-only extraction finds nothing
+    videos = scraper(lambda: app.scrape_tiktok_videos_playwright("Pasta Place", limit=4, timeout=10000))
+
+    assert videos == []